@@ -1,9 +1,9 @@
 """Command handling for LLM Terminal Chat"""
 
+import functools
 import os
 import re
 from collections.abc import Callable
-from pathlib import Path
 
 from prompt_toolkit.completion import PathCompleter
 
@@ -13,6 +13,9 @@ from session_logger import CONVERSATION_NAME_MAX_WORDS, sanitize_conversation_na
 from strings import t
 from ui import UI
 
+# PathCompleter holds only its options, so one instance serves every /rootdir
+_PATH_COMPLETER = PathCompleter(expanduser=True)
+
 
 def _extract_full_text(session_data: dict) -> str:
     """Concatenate all message contents from a loaded session."""
@@ -85,9 +88,13 @@ def _show_conversation_menu(
     items: list[str], item_formatter: Callable[[str], str]
 ) -> None:
     """Print the numbered conversation list (title and items only)."""
-    print(t("prompts.title_value", value=t("prompts.available_conversations")))
-    for i, item in enumerate(items, 1):
-        print(t("menus.item_format", index=i, item=item_formatter(item)))
+    lines = [t("prompts.title_value", value=t("prompts.available_conversations"))]
+    lines.extend(
+        t("menus.item_format", index=i, item=item_formatter(item))
+        for i, item in enumerate(items, 1)
+    )
+    # One write for the whole list: /reload can show hundreds of sessions
+    print("\n".join(lines))
 
 
 def _select_number(
@@ -161,6 +168,27 @@ def _extract_suggested_name(raw: str) -> str | None:
     return slug
 
 
+_SESSION_STEM_RE = re.compile(r"(\d{8}_\d{6})(?:_(.*))?")
+
+
+@functools.lru_cache(maxsize=1024)
+def _session_filename_fields(filename: str) -> tuple[str, str]:
+    """Split ``session_<ts>[_<name>].toml.zip`` into (display timestamp, name).
+
+    Cached: /reload re-formats the same files on every redisplay and search.
+    """
+    stem = filename.removeprefix("session_").removesuffix(".toml.zip")
+    ts_match = _SESSION_STEM_RE.fullmatch(stem)
+    if not ts_match:
+        return stem, ""
+    raw_ts = ts_match.group(1)
+    timestamp = (
+        f"{raw_ts[:4]}-{raw_ts[4:6]}-{raw_ts[6:8]} "
+        f"{raw_ts[9:11]}:{raw_ts[11:13]}:{raw_ts[13:15]}"
+    )
+    return timestamp, ts_match.group(2) or ""
+
+
 def format_session(path: str, meta: dict | None = None) -> str:
     """Format a session file path for the /reload listing.
 
@@ -168,19 +196,7 @@ def format_session(path: str, meta: dict | None = None) -> str:
     preview suffix. The name is colored GREEN when present, otherwise
     ``*no name*`` is shown.
     """
-    filename = os.path.basename(path)
-    stem = filename.replace("session_", "").replace(".toml.zip", "")
-    ts_match = re.fullmatch(r"(\d{8}_\d{6})(?:_(.*))?", stem)
-    if ts_match:
-        raw_ts = ts_match.group(1)
-        timestamp = (
-            f"{raw_ts[:4]}-{raw_ts[4:6]}-{raw_ts[6:8]} "
-            f"{raw_ts[9:11]}:{raw_ts[11:13]}:{raw_ts[13:15]}"
-        )
-        filename_name = ts_match.group(2) or ""
-    else:
-        timestamp = stem
-        filename_name = ""
+    timestamp, filename_name = _session_filename_fields(os.path.basename(path))
 
     meta = meta or {}
     name = meta.get("name", "") or filename_name
@@ -211,6 +227,24 @@ def format_session(path: str, meta: dict | None = None) -> str:
     )
 
 
+@functools.cache
+def _help_text() -> str:
+    """Full /help listing; config.COMMANDS is fixed at import time."""
+    lines = [t("commands.available_commands")]
+    for cmd, desc in config.COMMANDS.items():
+        lines.append(f"  {t('commands.cmd_highlight', value=cmd)} - {desc}")
+    lines.append(t("commands.help_ctrl_b", shortcut=t("keys.ctrl_b")))
+    lines.append(
+        t(
+            "commands.help_alt_enter",
+            send_key=t("keys.alt_enter"),
+            newline_key=t("keys.enter"),
+        )
+    )
+    lines.append(t("commands.help_pageup", shortcut=t("keys.page_up_down")))
+    return "\n".join(lines)
+
+
 class CommandHandler:
     def __init__(self, llm_client, session_logger, input_handler, chat_app):
         self.llm_client = llm_client
@@ -226,29 +260,27 @@ class CommandHandler:
         """
         command = command.strip()
         parts = command.split()
-        cmd = parts[0].lower()
+        cmd = parts[0]
+        if cmd not in self._DISPATCH:
+            # Commands are usually typed in lowercase; fold case only if needed
+            cmd = cmd.lower()
         args = parts[1:]
 
-        if cmd == "/help":
-            self._handle_help(args)
-        elif cmd == "/clear":
-            self._handle_clear()
-        elif cmd == "/bye":
+        if cmd == "/bye":
             return True  # Signal to quit
-        elif cmd == "/model":
-            self._handle_model(args)
-        elif cmd == "/reload":
-            self._handle_reload()
-        elif cmd == "/files":
-            self.handle_files_command()
-        elif cmd == "/rootdir":
-            self._handle_rootdir(args)
-        elif cmd == "/proxy":
-            self._handle_proxy(args)
-        elif cmd == "/nameconv":
-            self._handle_nameconv(args)
-        else:
+        entry = self._DISPATCH.get(cmd)
+        if entry is None:
             print(t("commands.unknown_command", cmd=cmd))
+            return False
+
+        handler, takes_args = entry
+        # e.g. /model reads the models from its menu, the proxy check and
+        # the switch itself: load config.json once for all of them
+        with config.snapshot():
+            if takes_args:
+                handler(self, args)
+            else:
+                handler(self)
 
         return False
 
@@ -263,18 +295,7 @@ class CommandHandler:
             else:
                 print(t("commands.no_help", cmd=cmd))
         else:
-            print(t("commands.available_commands"))
-            for cmd, desc in config.COMMANDS.items():
-                print(f"  {t('commands.cmd_highlight', value=cmd)} - {desc}")
-            print(t("commands.help_ctrl_b", shortcut=t("keys.ctrl_b")))
-            print(
-                t(
-                    "commands.help_alt_enter",
-                    send_key=t("keys.alt_enter"),
-                    newline_key=t("keys.enter"),
-                )
-            )
-            print(t("commands.help_pageup", shortcut=t("keys.page_up_down")))
+            print(_help_text())
 
     def _handle_clear(self):
         """Clear conversation history and start a fresh session."""
@@ -362,22 +383,23 @@ class CommandHandler:
             if self.chat_app.root_dir is not None
             else t("sessions.free_chat_display")
         )
-        print(
+        header = (
             t(
                 "sessions.project_root",
                 root=t("sessions.root_value", value=root_display),
-            )
-        )
-        print(
+            ),
             t(
                 "sessions.conversation_dir",
                 dir=t("sessions.dir_value", value=self.session_logger.conversation_dir),
-            )
+            ),
         )
-        print()
+        print("\n".join(header) + "\n")
 
-        def item_formatter(path: str) -> str:
-            return format_session(path, metadata_cache.get(path))
+        # Format each row once; the list is redisplayed after every bad input
+        formatted = {
+            path: format_session(path, metadata_cache.get(path)) for path in sessions
+        }
+        item_formatter = formatted.__getitem__
 
         # Show the full conversation list once
         _show_conversation_menu(sessions, item_formatter)
@@ -432,9 +454,7 @@ class CommandHandler:
                     print(
                         t(
                             "sessions.loaded_conversation",
-                            session=format_session(
-                                selected_path, metadata_cache.get(selected_path)
-                            ),
+                            session=formatted[selected_path],
                         )
                     )
                     print(
@@ -625,9 +645,9 @@ class CommandHandler:
         if args:
             # Direct path argument provided
             new_root = resolve_path(args[0])
-            if Path(new_root).is_dir():
+            if os.path.isdir(new_root):
                 try:
-                    self.chat_app.set_root_dir(str(new_root))
+                    self.chat_app.set_root_dir(new_root, already_resolved=True)
                 except ValueError as e:
                     print(f"{t('common.error_prefix')} {e}")
             else:
@@ -644,7 +664,7 @@ class CommandHandler:
                     prompt=t("prompts.root_enter"),
                     zero_label=t("menus.free_chat_label"),
                     allow_manual=True,
-                    completer=PathCompleter(expanduser=True),
+                    completer=_PATH_COMPLETER,
                 )
             except (KeyboardInterrupt, EOFError):
                 print(t("common.selection_cancelled"))
@@ -653,14 +673,18 @@ class CommandHandler:
                 self.chat_app.set_root_dir(self.chat_app.FREE_CHAT_MODE)
                 return
             if sel_type == "item":
-                self.chat_app.set_root_dir(sel_value)
-                return
+                # Recent roots are stored resolved
+                if os.path.isdir(sel_value):
+                    self.chat_app.set_root_dir(sel_value, already_resolved=True)
+                    return
+                self.chat_app.reject_recent_root(sel_value)
+                continue
             # manual path entry
             try:
                 resolved = resolve_path(sel_value)
-                if Path(resolved).is_dir():
+                if os.path.isdir(resolved):
                     print(f"{t('common.using_prefix')} {resolved}")
-                    self.chat_app.set_root_dir(resolved)
+                    self.chat_app.set_root_dir(resolved, already_resolved=True)
                     return
                 print(
                     f"{t('common.error_prefix')} {t('common.not_valid_directory', input=sel_value)}"
@@ -702,3 +726,15 @@ class CommandHandler:
             # manual proxy URL entry -- retry on failure
             if self.chat_app.set_proxy(sel_value):
                 return
+
+    # Slash command -> (handler, takes_args); /bye is handled inline
+    _DISPATCH: dict[str, tuple[Callable, bool]] = {
+        "/help": (_handle_help, True),
+        "/clear": (_handle_clear, False),
+        "/model": (_handle_model, True),
+        "/reload": (_handle_reload, False),
+        "/files": (handle_files_command, False),
+        "/rootdir": (_handle_rootdir, True),
+        "/proxy": (_handle_proxy, True),
+        "/nameconv": (_handle_nameconv, True),
+    }
@@ -8,24 +8,31 @@ CROSS-PLATFORM COMPATIBILITY NOTES:
 - Logging and temp file handling use cross-platform Python stdlib
 """
 
+import contextlib
+import contextvars
+import functools
 import json
 import logging
 import os
 import sys
+import types
+from collections.abc import Iterator
 from pathlib import Path
 
-from platformdirs import user_config_dir, user_data_dir
-from rich.logging import RichHandler
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
 
 from strings import t
 
 # Application Configuration
 APP_NAME = "thin-wrap"
 
-# App directories (appauthor=False for consistent cross-platform paths)
-CONFIG_DIR = user_config_dir(APP_NAME, appauthor=False)
-DATA_DIR = user_data_dir(APP_NAME, appauthor=False, ensure_exists=True)
-CONVERSATIONS_DIR = os.path.join(DATA_DIR, "conversations")
+# App directories (appauthor=False for consistent cross-platform paths).
+# CONFIG_DIR, DATA_DIR and CONVERSATIONS_DIR are built on first access (see
+# __getattr__): platformdirs is only imported, and the data directory only
+# created, once something needs them
 
 # Logging Configuration
 LOG_LEVEL = logging.WARNING
@@ -36,13 +43,55 @@ LOG_FORMAT = "%(message)s"  # for RichHandler
 # LOG_FILE = 'llm_chat_debug.log' #for logging.FileHandler's handler
 # LOG_HANDLER_FILE = logging.FileHandler(LOG_FILE, mode='w', encoding='utf-8')  # Output to file
 # LOG_HANDLER_DEFAULT = logging.StreamHandler() # Defaults handler (equivalent to not specifying anything)
-LOG_HANDLER_RICH = RichHandler(
-    rich_tracebacks=True,
-    tracebacks_show_locals=True,
-    markup=True,
-    show_time=True,
-    show_path=True,
-)
+# LOG_HANDLER_RICH is built on first access (see __getattr__)
+
+
+def _make_rich_handler() -> logging.Handler:
+    from rich.logging import RichHandler
+
+    return RichHandler(
+        rich_tracebacks=True,
+        # Rendering every frame's locals (whole conversation histories, file
+        # contents) makes error logs slow and huge; opt in when debugging
+        tracebacks_show_locals=bool(os.environ.get("THIN_WRAP_DEBUG")),
+        markup=True,
+        show_time=True,
+        show_path=True,
+    )
+
+
+def _make_config_dir() -> str:
+    from platformdirs import user_config_dir
+
+    return user_config_dir(APP_NAME, appauthor=False)
+
+
+def _make_data_dir() -> str:
+    from platformdirs import user_data_dir
+
+    return user_data_dir(APP_NAME, appauthor=False, ensure_exists=True)
+
+
+_LAZY_ATTRS = {
+    "CONFIG_DIR": _make_config_dir,
+    "DATA_DIR": _make_data_dir,
+    "CONVERSATIONS_DIR": lambda: os.path.join(_lazy("DATA_DIR"), "conversations"),
+    "LOG_HANDLER_RICH": _make_rich_handler,
+}
+
+
+def _lazy(name: str):
+    """Return module attribute *name*, building and storing it on first use."""
+    module_globals = globals()
+    if name not in module_globals:
+        module_globals[name] = _LAZY_ATTRS[name]()
+    return module_globals[name]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRS:
+        return _lazy(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def setup_logging():
@@ -51,7 +100,7 @@ def setup_logging():
         level=LOG_LEVEL,
         format=LOG_FORMAT,
         handlers=[
-            LOG_HANDLER_RICH,
+            _lazy("LOG_HANDLER_RICH"),
             # LOG_HANDLER_DEFAULT,
             # LOG_HANDLER_FILE,
         ],
@@ -64,8 +113,16 @@ def setup_logging():
 # Global variable to store config file path once determined
 _CONFIG_PATH: str | None = None
 
-# Cache keyed by (path, st_mtime_ns) → validated config dict
-_CONFIG_CACHE: dict[tuple[str, int], dict] = {}
+# Cache keyed by path → (st_mtime_ns, st_size, validated config dict); one
+# entry per file, replaced whenever the file changes
+_CONFIG_CACHE: dict[str, tuple[int, int, dict]] = {}
+
+
+# Set by snapshot(): a holder dict filled with the config on first use, so
+# every get_models/backup call inside one command sees the same data
+_SNAPSHOT: contextvars.ContextVar[dict | None] = contextvars.ContextVar(
+    "config_snapshot", default=None
+)
 
 
 def set_config_path(config_path: str | None = None) -> None:
@@ -86,8 +143,39 @@ def invalidate() -> None:
     _CONFIG_CACHE.clear()
 
 
+@contextlib.contextmanager
+def snapshot() -> Iterator[None]:
+    """Load config.json at most once for the duration of the block.
+
+    Nested blocks share the outer snapshot. Nothing is read until
+    get_models() or backup() is first called inside the block.
+    """
+    if _SNAPSHOT.get() is not None:
+        yield
+        return
+    token = _SNAPSHOT.set({})
+    try:
+        yield
+    finally:
+        _SNAPSHOT.reset(token)
+
+
+def _current_config() -> dict:
+    """Return the snapshotted config if inside snapshot(), else load it."""
+    holder = _SNAPSHOT.get()
+    if holder is None:
+        return _load_config_internal()
+    if "config" not in holder:
+        holder["config"] = _load_config_internal()
+    return holder["config"]
+
+
+@functools.cache
 def _get_script_dir() -> Path:
-    """Get directory where script/executable is located (supports pyinstaller)."""
+    """Get directory where script/executable is located (supports pyinstaller).
+
+    Cached: the location cannot change while the process runs.
+    """
     if getattr(sys, "frozen", False):
         # Running as compiled executable (pyinstaller)
         return Path(sys.executable).parent.resolve()
@@ -96,6 +184,9 @@ def _get_script_dir() -> Path:
         return Path(__file__).parent.resolve()
 
 
+_REQUIRED_MODEL_FIELDS = ("model", "api_key", "api_base_url")
+
+
 def _load_config_internal(config_path: str | None = None) -> dict:
     """
     Internal method to load configuration from config.json file.
@@ -165,16 +256,15 @@ def _load_config_internal(config_path: str | None = None) -> dict:
 
     _CONFIG_PATH = str(config_file)
 
-    cache_key = (
-        str(config_file),
-        os.stat(config_file).st_mtime_ns,
-    )
-    if cache_key in _CONFIG_CACHE:
-        return _CONFIG_CACHE[cache_key]
+    st = os.stat(config_file)
+    cached = _CONFIG_CACHE.get(_CONFIG_PATH)
+    if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
 
     try:
-        with open(config_file, encoding="utf-8") as f:
-            config_data = json.load(f)
+        raw = config_file.read_bytes()
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        config_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
     except json.JSONDecodeError as e:
         raise json.JSONDecodeError(
             f"Invalid JSON in {config_file}: {e.msg}", e.doc, e.pos
@@ -185,15 +275,16 @@ def _load_config_internal(config_path: str | None = None) -> dict:
 
     # STRICT VALIDATION FOR NEW FORMAT
     for model_name, model_config in config_data["models"].items():
-        if "model" not in model_config:
-            raise ValueError(
-                f"Model '{model_name}' is missing required 'model' field. "
-                f"Every entry must now contain 'model': 'actual-model-name'"
+        # Report every missing field at once rather than one per edit/retry
+        missing = [f for f in _REQUIRED_MODEL_FIELDS if f not in model_config]
+        if missing:
+            message = (
+                f"Model '{model_name}' is missing required field(s): "
+                + ", ".join(f"'{f}'" for f in missing)
             )
-        if "api_key" not in model_config:
-            raise ValueError(f"Model '{model_name}' missing 'api_key' field")
-        if "api_base_url" not in model_config:
-            raise ValueError(f"Model '{model_name}' missing 'api_base_url' field")
+            if "model" in missing:
+                message += ". Every entry must now contain 'model': 'actual-model-name'"
+            raise ValueError(message)
 
         if "proxy" in model_config:
             if not isinstance(model_config["proxy"], bool):
@@ -247,14 +338,15 @@ def _load_config_internal(config_path: str | None = None) -> dict:
             )
         backup_config["overwrite_original"] = backup_config.pop("backup_old_file")
 
-    _CONFIG_CACHE[cache_key] = config_data
+    _CONFIG_CACHE[_CONFIG_PATH] = (st.st_mtime_ns, st.st_size, config_data)
     return config_data
 
 
 def get_models() -> dict:
     """
     Get the models configuration from config.json.
-    Re-reads the file every time it's called to pick up changes.
+    Re-reads the file every time it's called to pick up changes (once per
+    snapshot() block).
 
     Returns:
         dict: Models configuration dictionary
@@ -264,14 +356,15 @@ def get_models() -> dict:
         json.JSONDecodeError: If config.json is invalid
         ValueError: If config.json is missing required sections
     """
-    config_data = _load_config_internal()
+    config_data = _current_config()
     return config_data.get("models", {})
 
 
 def backup() -> dict:
     """
     Get the backup configuration from config.json.
-    Re-reads the file every time it's called to pick up changes.
+    Re-reads the file every time it's called to pick up changes (once per
+    snapshot() block).
 
     Returns:
         dict: Backup configuration with keys:
@@ -283,7 +376,7 @@ def backup() -> dict:
     Raises:
         FileNotFoundError, json.JSONDecodeError, ValueError
     """
-    config_data = _load_config_internal()
+    config_data = _current_config()
     return config_data.get("backup", {})
 
 
@@ -301,19 +394,23 @@ UNICODE_REPLACEMENTS = {
     "\u2026": "...",
     "\u00a0": " ",
 }
+# Same mapping as a str.translate table: one pass instead of one per entry
+UNICODE_REPLACEMENTS_TABLE = str.maketrans(UNICODE_REPLACEMENTS)
 
 # Terminal Configuration
 TERMINAL_WIDTH_FALLBACK = 120
 
-# Commands
-COMMANDS = {
-    "/clear": t("commands.descriptions.clear"),
-    "/bye": t("commands.descriptions.bye"),
-    "/help": t("commands.descriptions.help"),
-    "/model": t("commands.descriptions.model"),
-    "/reload": t("commands.descriptions.reload"),
-    "/rootdir": t("commands.descriptions.rootdir"),
-    "/files": t("commands.descriptions.files"),
-    "/proxy": t("commands.descriptions.proxy"),
-    "/nameconv": t("commands.descriptions.nameconv"),
-}
+# Commands (read-only: the /help text built from it is cached)
+COMMANDS = types.MappingProxyType(
+    {
+        "/clear": t("commands.descriptions.clear"),
+        "/bye": t("commands.descriptions.bye"),
+        "/help": t("commands.descriptions.help"),
+        "/model": t("commands.descriptions.model"),
+        "/reload": t("commands.descriptions.reload"),
+        "/rootdir": t("commands.descriptions.rootdir"),
+        "/files": t("commands.descriptions.files"),
+        "/proxy": t("commands.descriptions.proxy"),
+        "/nameconv": t("commands.descriptions.nameconv"),
+    }
+)
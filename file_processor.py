@@ -1,33 +1,87 @@
+import contextlib
 import datetime
 import difflib
+import functools
 import logging
 import os
 import re
-import shutil
+import stat
 import tempfile
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import config
-from path_utils import resolve_path
 from strings import t
 from tags import Xml
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on threads reading context files for one query
+_MAX_READ_WORKERS = 16
 
-def _read_file_content(full_path: str, root_dir: str) -> str:
-    """Read file content with robust error handling and path resolution."""
+
+# Context file path → ((st_ino, st_mtime_ns, st_ctime_ns, st_size), text); the
+# same files are sent with every prompt of a session, so unchanged ones cost a
+# single stat. Inode and ctime also catch replacements and same-size edits that
+# land within a coarse mtime resolution (the LLM would otherwise rewrite stale
+# content over the user's edit).
+_FILE_CACHE: dict[str, tuple[tuple[int, int, int, int], str]] = {}
+_FILE_CACHE_MAXSIZE = 256
+_FILE_CACHE_LOCK = threading.Lock()
+
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
+
+
+def _read_bytes(path: str) -> bytes:
+    """Read a whole file with one open, one fstat and usually one read."""
+    fd = os.open(path, _OPEN_FLAGS)
     try:
-        # Resolve the path first
-        resolved_path = resolve_path(full_path, root_dir)
-        path = Path(resolved_path)
+        size = os.fstat(fd).st_size
+        # Asking for one byte more than st_size makes a short read prove EOF;
+        # partial reads and files that report a wrong size (e.g. under /proc)
+        # fall back to reading until EOF.
+        data = os.read(fd, size + 1)
+        if len(data) == size:
+            return data
+        chunks = [data]
+        while chunk := os.read(fd, 65536):
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
 
-        if not path.exists():
-            raise FileNotFoundError(
-                f"File does not exist: {full_path} (resolved to: {resolved_path})"
-            )
 
-        return path.read_text(encoding="utf-8")
+def _read_file_content(full_path: str, root_dir: str) -> str:
+    """Read file content with robust error handling and path resolution."""
+    try:
+        # Only joined onto root_dir, not realpath'ed: opening the file
+        # follows symlinks anyway, so resolving them first is wasted syscalls
+        resolved_path = os.path.join(root_dir or "", os.path.expanduser(full_path))
+
+        # A missing file surfaces as FileNotFoundError from os.stat
+        st = os.stat(resolved_path)
+        key = (st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size)
+        with _FILE_CACHE_LOCK:
+            cached = _FILE_CACHE.get(resolved_path)
+        if cached and cached[0] == key:
+            return cached[1]
+
+        text = _read_bytes(resolved_path).decode("utf-8")
+        if "\r" in text:
+            # Universal newlines, as Path.read_text gave
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+        with _FILE_CACHE_LOCK:
+            if (
+                resolved_path not in _FILE_CACHE
+                and len(_FILE_CACHE) >= _FILE_CACHE_MAXSIZE
+            ):
+                # Oldest entry out; plenty for any realistic context set
+                _FILE_CACHE.pop(next(iter(_FILE_CACHE)))
+            _FILE_CACHE[resolved_path] = (key, text)
+        return text
     except PermissionError:
         raise PermissionError(
             f"Cannot read file due to permissions: {full_path}"
@@ -40,105 +94,59 @@ def _read_file_content(full_path: str, root_dir: str) -> str:
         raise Exception(f"Error reading file {full_path}: {str(e)}") from e
 
 
-def generate_file_query(
-    root_dir: str,
-    readable_files: list[str],
-    writable_files: list[str],
-    user_request: str,
-) -> str:
-    """
-    Generate the LLM query in the requested XML format using absolute paths.
-    Minimal whitespace and no unnecessary blank lines.
+def _read_files(paths: list[str], root_dir: str) -> dict[str, str | Exception]:
+    """Read every path, concurrently when there are several.
+
+    Each value is the file content or the exception raised reading it. File
+    reads release the GIL, so open/read latency (network mounts, cold cache)
+    overlaps instead of adding up.
     """
-    query = (
-        Xml.o(
-            Xml.SOURCE_CODE_FILES,
-            'guidance="USER\'S REQUEST SOURCE CODE FILES CONTEXT FOR THIS SOLE REQUEST (THIS CONTEXT SHALL PREVAIL ON ANY PAST CONTEXT)"',
-        )
-        + "\n"
-    )
 
-    query += (
-        Xml.o(Xml.ROOT_DIRECTORY_OF_PROJECT)
-        + root_dir
-        + Xml.c(Xml.ROOT_DIRECTORY_OF_PROJECT)
-        + "\n"
-    )
+    def read(path: str) -> str | Exception:
+        try:
+            return _read_file_content(path, root_dir)
+        except Exception as e:
+            return e
 
-    # Read-only files
-    query += (
-        Xml.o(Xml.READ_ONLY_FILES, 'guidance="FILES TO BE READ ONLY (DO NOT EDIT)"')
-        + "\n"
-    )
-    if readable_files:
-        for path in readable_files:
-            try:
-                content = _read_file_content(path, root_dir)
-                query += (
-                    Xml.o(Xml.READ_ONLY_FILE, f'path="{path}"')
-                    + "\n"
-                    + content
-                    + "\n"
-                    + Xml.c(Xml.READ_ONLY_FILE)
-                    + "\n"
-                )
-            except Exception as e:
-                logger.error(f"Failed to read readable file {path}: {e}")
-                query += (
-                    Xml.o(Xml.READ_ONLY_FILE, f'path="{path}"')
-                    + "\n[Error reading file: {str(e)}]\n"
-                    + Xml.c(Xml.READ_ONLY_FILE)
-                    + "\n"
-                )
-    else:
-        query += "No files inputted by the user to be read.\n"
-    query += Xml.c(Xml.READ_ONLY_FILES) + "\n"
+    unique = list(dict.fromkeys(paths))
+    if len(unique) <= 1:
+        return {path: read(path) for path in unique}
+    with ThreadPoolExecutor(max_workers=min(_MAX_READ_WORKERS, len(unique))) as pool:
+        return dict(zip(unique, pool.map(read, unique), strict=True))
 
-    # Editable files
-    query += (
-        Xml.o(Xml.EDITABLE_FILES, 'guidance="FILES THAT ARE EDITABLE BY YOU, THE LLM"')
-        + "\n"
-    )
-    if writable_files:
-        for path in writable_files:
-            try:
-                content = _read_file_content(path, root_dir)
-                query += (
-                    Xml.o(Xml.EDITABLE_FILE, f'path="{path}"')
-                    + "\n"
-                    + content
-                    + "\n"
-                    + Xml.c(Xml.EDITABLE_FILE)
-                    + "\n"
-                )
-            except Exception as e:
-                logger.error(f"Failed to read editable file {path}: {e}")
-                query += (
-                    Xml.o(Xml.EDITABLE_FILE, f'path="{path}"')
-                    + "\n[Error reading file: {str(e)}]\n"
-                    + Xml.c(Xml.EDITABLE_FILE)
-                    + "\n"
-                )
-    else:
-        query += "No editable files inputted by the user.\n"
-    query += Xml.c(Xml.EDITABLE_FILES) + "\n"
 
-    query += Xml.c(Xml.SOURCE_CODE_FILES) + "\n"
+def _append_file_blocks(
+    parts: list[str],
+    file_tag: str,
+    paths: list[str],
+    contents: dict[str, str | Exception],
+) -> None:
+    """Append one ``file_tag`` block per path, with its content or read error."""
+    label = "readable" if file_tag == Xml.READ_ONLY_FILE else "editable"
+    # Tag text is built once per section; each file only adds its own path
+    open_head, open_tail = Xml.o(file_tag, 'path="\0"').split("\0")
+    open_tail += "\n"
+    close = Xml.c(file_tag) + "\n"
+    for path in paths:
+        parts += (open_head, path, open_tail)
+        content = contents[path]
+        if isinstance(content, Exception):
+            logger.error(f"Failed to read {label} file {path}: {content}")
+            parts.append(f"[Error reading file: {content}]\n")
+        else:
+            parts += (content, "\n")
+        parts.append(close)
 
-    # User request
-    query += Xml.o(Xml.USER_REQUEST) + "\n"
-    query += user_request.strip() + "\n"
-    query += Xml.c(Xml.USER_REQUEST) + "\n"
 
-    # Response formatting instructions
-    query += (
+def _response_formatting(root_dir: str) -> str:
+    """The response formatting instructions block for *root_dir*."""
+    return (
         Xml.o(
             Xml.RESPONSE_FORMATTING,
             'guidance="STRICT RESPONSE FORMATTING INSTRUCTIONS"',
         )
         + "\n"
-    )
-    query += f"""You, the LLM, must respond using ONLY the custom XML-style tags prefixed with "prompt_engineering_answer_".
+        + f"""You, the LLM, must respond using ONLY the custom XML-style tags prefixed with "prompt_engineering_answer_".
 Instructions in square brackets [] are for you and should not appear in your response.
 
 Required format (in this exact order: edited files, then new files, then comments):
@@ -172,40 +180,132 @@ CRITICAL RULES:
 - Preserve exact code formatting: indentation, trailing newlines, and existing comments must remain unchanged.
 - Any new code comments you add must be professional and intended for future readers of the codebase.
 - If multiple viable approaches exist for the user's request, summarize the options in <{Xml.COMMENTS}> without editing or creating files. Include brief code snippets if helpful, and provide clear pros and cons from a professional software engineering perspective. The user will then select the preferred approach.\n"""
-    query += Xml.c(Xml.RESPONSE_FORMATTING)
+        + Xml.c(Xml.RESPONSE_FORMATTING)
+    )
 
-    return query
 
+# The instructions are static apart from root_dir: render them once around a
+# NUL placeholder (never part of the text) and join with each query's root_dir
+_RESPONSE_FORMATTING_PARTS = _response_formatting("\0").split("\0")
 
-def _extract_section_content(response: str, section_tag: str) -> str:
-    """Extract section content; tolerant to missing tags or whitespace."""
-    pattern = Xml.section_pattern(section_tag)
-    match = re.search(pattern, response, re.DOTALL | re.IGNORECASE)
-    return match.group(1).strip() if match else ""
 
+def generate_file_query(
+    root_dir: str,
+    readable_files: list[str],
+    writable_files: list[str],
+    user_request: str,
+) -> str:
+    """
+    Generate the LLM query in the requested XML format using absolute paths.
+    Minimal whitespace and no unnecessary blank lines.
+    """
+    # Collected as parts and joined once: repeated += would copy the growing
+    # query (file contents included) on every append
+    parts = [
+        Xml.o(
+            Xml.SOURCE_CODE_FILES,
+            'guidance="USER\'S REQUEST SOURCE CODE FILES CONTEXT FOR THIS SOLE REQUEST (THIS CONTEXT SHALL PREVAIL ON ANY PAST CONTEXT)"',
+        ),
+        "\n",
+        Xml.o(Xml.ROOT_DIRECTORY_OF_PROJECT),
+        root_dir,
+        Xml.c(Xml.ROOT_DIRECTORY_OF_PROJECT),
+        "\n",
+    ]
 
-def _extract_files(section_content: str, file_tag: str) -> list[tuple[str, str]]:
-    """Extract (path, content) pairs; tolerant to malformed entries."""
-    if not section_content:
-        return []
+    contents = _read_files(readable_files + writable_files, root_dir)
+
+    # Read-only files
+    parts += (
+        Xml.o(Xml.READ_ONLY_FILES, 'guidance="FILES TO BE READ ONLY (DO NOT EDIT)"'),
+        "\n",
+    )
+    if readable_files:
+        _append_file_blocks(parts, Xml.READ_ONLY_FILE, readable_files, contents)
+    else:
+        parts.append("No files inputted by the user to be read.\n")
+    parts += (Xml.c(Xml.READ_ONLY_FILES), "\n")
+
+    # Editable files
+    parts += (
+        Xml.o(Xml.EDITABLE_FILES, 'guidance="FILES THAT ARE EDITABLE BY YOU, THE LLM"'),
+        "\n",
+    )
+    if writable_files:
+        _append_file_blocks(parts, Xml.EDITABLE_FILE, writable_files, contents)
+    else:
+        parts.append("No editable files inputted by the user.\n")
+    parts += (Xml.c(Xml.EDITABLE_FILES), "\n")
+
+    parts += (Xml.c(Xml.SOURCE_CODE_FILES), "\n")
 
-    pattern = Xml.file_pattern(file_tag)
-    matches = re.findall(pattern, section_content, re.DOTALL | re.IGNORECASE)
+    # User request
+    parts += (
+        Xml.o(Xml.USER_REQUEST),
+        "\n",
+        user_request.strip(),
+        "\n",
+        Xml.c(Xml.USER_REQUEST),
+        "\n",
+    )
+
+    # Response formatting instructions
+    parts.append(root_dir.join(_RESPONSE_FORMATTING_PARTS))
+
+    return "".join(parts)
+
+
+@functools.cache
+def _file_re(tag: str) -> re.Pattern:
+    return re.compile(Xml.file_pattern(tag), re.DOTALL | re.IGNORECASE)
 
-    extracted = []
-    for path, content in matches:
-        cleaned_path = path.strip()
+
+_SECTIONS_RE = re.compile(
+    Xml.sections_pattern(Xml.EDITED_FILES, Xml.NEW_FILES, Xml.COMMENTS),
+    re.DOTALL | re.IGNORECASE,
+)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _split_sections(response: str) -> tuple[dict[str, str], str]:
+    """Split a response into answer sections and the text outside them.
+
+    One scan returns each section's stripped content keyed by lowercase tag
+    (first occurrence wins; missing sections are absent) and the remaining
+    text, which is only checked for extraneous content.
+    """
+    sections: dict[str, str] = {}
+    outside = []
+    pos = 0
+    for match in _SECTIONS_RE.finditer(response):
+        outside.append(response[pos : match.start()])
+        pos = match.end()
+        sections.setdefault(match.group(1).lower(), match.group(2).strip())
+    outside.append(response[pos:])
+    return sections, "".join(outside)
+
+
+def _extract_files(section_content: str, file_tag: str) -> Iterator[tuple[str, str]]:
+    """Yield (path, content) pairs; tolerant to malformed entries.
+
+    A generator over finditer, so a response with many large files is never
+    held twice in memory as a list of match tuples.
+    """
+    if not section_content:
+        return
+
+    extracted_any = False
+    for match in _file_re(file_tag).finditer(section_content):
+        cleaned_path = match.group(1).strip()
         if cleaned_path:
-            content = content.lstrip("\n")
-            extracted.append((cleaned_path, content))
+            extracted_any = True
+            yield cleaned_path, match.group(2).lstrip("\n")
         else:
             logger.warning(f"Skipping {file_tag} entry with empty path")
 
-    if not extracted and section_content.strip():
+    if not extracted_any and section_content.strip():
         logger.warning(f"Section <{file_tag}> present but no valid files extracted")
 
-    return extracted
-
 
 def _secure_path(full_path: Path, should_exist: bool) -> None:
     """Validate that the path is absolute and its existence matches expectation."""
@@ -223,10 +323,18 @@ def _write_file(
     *,
     preserve_permissions_from: Path | None = None,
     encoding: str = "utf-8",
+    make_parents: bool = True,
 ) -> None:
     target_path = Path(target_path)
     parent_dir = target_path.parent
-    parent_dir.mkdir(parents=True, exist_ok=True)
+    if make_parents:
+        parent_dir.mkdir(parents=True, exist_ok=True)
+
+    # One stat of the source instead of exists() + shutil.copymode's own stat
+    mode = None
+    if preserve_permissions_from is not None:
+        with contextlib.suppress(FileNotFoundError):
+            mode = stat.S_IMODE(os.stat(preserve_permissions_from).st_mode)
 
     with tempfile.NamedTemporaryFile(
         mode="w",
@@ -237,11 +345,15 @@ def _write_file(
         suffix=".tmp",
     ) as tmp_file:
         tmp_path = Path(tmp_file.name)
+        if mode is not None and hasattr(os, "fchmod"):
+            # Set on the open descriptor: no second lookup of the temp path
+            os.fchmod(tmp_file.fileno(), mode)
+            mode = None
         tmp_file.write(new_content)
 
     try:
-        if preserve_permissions_from and preserve_permissions_from.exists():
-            shutil.copymode(preserve_permissions_from, tmp_path)
+        if mode is not None:
+            os.chmod(tmp_path, mode)  # platforms without fchmod
         os.replace(tmp_path, target_path)
     except Exception:
         tmp_path.unlink(missing_ok=True)
@@ -262,21 +374,17 @@ def _compute_git_stat_diff(old_content: str, new_content: str) -> tuple[int, int
     old_lines = old_content.splitlines(keepends=True)
     new_lines = new_content.splitlines(keepends=True)
 
-    # Use difflib's unified_diff to get changes
-    diff_gen = difflib.unified_diff(old_lines, new_lines, n=0, lineterm="")
+    # Count straight from the opcodes rather than rendering a unified diff and
+    # re-parsing its text (which also miscounted removed lines starting "--")
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
 
     insertions = 0
     deletions = 0
 
-    for line in diff_gen:
-        # Skip header lines (---, +++, @@)
-        if line.startswith("---") or line.startswith("+++") or line.startswith("@@"):
-            continue
-
-        if line.startswith("+"):
-            insertions += 1
-        elif line.startswith("-"):
-            deletions += 1
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != "equal":
+            insertions += j2 - j1
+            deletions += i2 - i1
 
     return insertions, deletions
 
@@ -329,9 +437,10 @@ def parse_xml_response(llm_response: str) -> str:
     """
     logger.debug("Starting parse_response")
 
-    edited_section = _extract_section_content(llm_response, Xml.EDITED_FILES)
-    new_section = _extract_section_content(llm_response, Xml.NEW_FILES)
-    comments = _extract_section_content(llm_response, Xml.COMMENTS)
+    sections, clean = _split_sections(llm_response)
+    edited_section = sections.get(Xml.EDITED_FILES, "")
+    new_section = sections.get(Xml.NEW_FILES, "")
+    comments = sections.get(Xml.COMMENTS, "")
 
     # Get backup configuration (reloads config each time)
     backup_config = config.backup()
@@ -340,15 +449,23 @@ def parse_xml_response(llm_response: str) -> str:
     extra_string = backup_config.get("extra_string", "thin-wrap")
     overwrite_original = backup_config.get("overwrite_original", True)
 
+    edited_count = 0
+    new_count = 0
+
     for path_str, content in _extract_files(edited_section, Xml.EDITED_FILE):
+        edited_count += 1
         try:
             path = Path(path_str)
             _secure_path(path, should_exist=True)
 
+            # Edits never create directories: the file was just read from
+            # the same one, so the mkdir in _write_file is skipped
             if not backup_enabled:
                 # No backup: direct atomic overwrite with permission preservation
                 old_content = path.read_text(encoding="utf-8")
-                _write_file(path, content, preserve_permissions_from=path)
+                _write_file(
+                    path, content, preserve_permissions_from=path, make_parents=False
+                )
                 print(t("files.edited", path=path))
                 _report_diff(old_content, content, path.name)
 
@@ -370,12 +487,16 @@ def parse_xml_response(llm_response: str) -> str:
             if overwrite_original:
                 old_content = path.read_text(encoding="utf-8")
                 os.replace(path, backup)
-                _write_file(path, content, preserve_permissions_from=backup)
+                _write_file(
+                    path, content, preserve_permissions_from=backup, make_parents=False
+                )
                 print(t("files.edited", path=path))
                 _report_diff(old_content, content, path.name)
             else:
                 old_content = path.read_text(encoding="utf-8")
-                _write_file(backup, content, preserve_permissions_from=path)
+                _write_file(
+                    backup, content, preserve_permissions_from=path, make_parents=False
+                )
                 print(t("files.created_timestamped", path=backup))
                 _report_diff(old_content, content, backup.name)
 
@@ -384,6 +505,7 @@ def parse_xml_response(llm_response: str) -> str:
             print(t("files.error_editing", path=path_str, error=e))
 
     for path_str, content in _extract_files(new_section, Xml.NEW_FILE):
+        new_count += 1
         try:
             path = Path(path_str)
             _secure_path(path, should_exist=False)
@@ -395,20 +517,11 @@ def parse_xml_response(llm_response: str) -> str:
             logger.error(f"Failed to create {path_str}: {e}")
             print(t("files.error_creating", path=path_str, error=e))
 
-    clean = llm_response
-    for tag in [Xml.EDITED_FILES, Xml.NEW_FILES, Xml.COMMENTS]:
-        clean = re.sub(
-            Xml.removal_pattern(tag), "", clean, flags=re.DOTALL | re.IGNORECASE
-        )
-
-    extraneous = re.sub(r"\s+", " ", clean).strip()
+    extraneous = _WHITESPACE_RE.sub(" ", clean).strip()
     if extraneous:
         logger.warning(f"Extraneous content in response:\n{extraneous[:500]}")
 
-    logger.info(
-        f"Parsing complete. Edited: {len(_extract_files(edited_section, Xml.EDITED_FILE))}, "
-        f"Created: {len(_extract_files(new_section, Xml.NEW_FILE))}"
-    )
+    logger.info(f"Parsing complete. Edited: {edited_count}, Created: {new_count}")
 
     return comments.strip()
 
@@ -1,14 +1,58 @@
 """Persistent history for recent roots and proxies, stored in a single JSON file."""
 
+import functools
 import json
 import logging
+import os
+import stat
+import tempfile
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
-from proxy_wrapper import normalize_proxy_url, validate_proxy_url
+from proxy_wrapper import normalize_proxy_url
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+def _loads(raw: bytes) -> dict:
+    """Parse history JSON from raw bytes."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps(data: dict) -> bytes:
+    """Serialize history JSON to indented UTF-8 bytes.
+
+    Both branches produce identical bytes (non-ASCII paths are written as
+    UTF-8, not escaped), so the unchanged-content check in _save holds
+    whether or not orjson is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+@functools.cache
+def _default_file_mode() -> int:
+    """Mode a plain open() would give a new file under the process umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# Cache keyed by path → (st_mtime_ns, st_size, document, serialized bytes)
+_HISTORY_CACHE: dict[str, tuple[int, int, dict, bytes]] = {}
+_HISTORY_CACHE_LOCK = threading.Lock()
+
+
 class HistoryStore:
     """Loads, saves and maintains recent_root_dirs and recent_proxies lists."""
 
@@ -16,34 +60,58 @@ class HistoryStore:
         self.history_file = history_file
         self.recent_roots: list[str] = []
         self.recent_proxies: list[str] = []
+        # Parsed file contents (including keys this class does not own) and
+        # the bytes last read or written, so saves never re-read the file.
+        self._data: dict = {}
+        self._last_serialized = b""
+        # >0 while inside batch(); saves are then folded into one on exit
+        self._batch_depth = 0
+        self._batch_dirty = False
         self._load()
 
     # -----------------------------------------------------------------
     # public API
     # -----------------------------------------------------------------
 
-    def add_root(self, root: str) -> None:
-        """Normalise, deduplicate and persist *root* at the front."""
-        root = str(Path(root).resolve())
-        if root in self.recent_roots:
-            self.recent_roots.remove(root)
-        self.recent_roots.insert(0, root)
-        self.recent_roots = self.recent_roots[:10]
+    def add_root(self, root: str, *, already_resolved: bool = False) -> None:
+        """Normalise, deduplicate and persist *root* at the front.
+
+        Pass ``already_resolved=True`` when *root* comes from resolve_path to
+        skip the redundant symlink walk; a relative path is resolved anyway.
+        """
+        if not already_resolved or not os.path.isabs(root):
+            root = str(Path(root).resolve())
+        self.recent_roots = [root] + [r for r in self.recent_roots if r != root][:9]
         self._save()
 
+    def remove_root(self, root: str) -> None:
+        """Forget *root* (e.g. a directory that no longer exists) and persist."""
+        if root in self.recent_roots:
+            self.recent_roots = [r for r in self.recent_roots if r != root]
+            self._save()
+
     def add_proxy(self, proxy_url: str) -> None:
         """Normalise, deduplicate and persist *proxy_url* at the front."""
         if not proxy_url:
             return
         normalized = normalize_proxy_url(proxy_url)
-        if normalized in self.recent_proxies:
-            self.recent_proxies.remove(normalized)
-        elif proxy_url in self.recent_proxies:
-            self.recent_proxies.remove(proxy_url)
-        self.recent_proxies.insert(0, normalized)
-        self.recent_proxies = self.recent_proxies[:10]
+        self.recent_proxies = [normalized] + [
+            p for p in self.recent_proxies if p != normalized and p != proxy_url
+        ][:9]
         self._save()
 
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Coalesce every save made inside the block into a single write."""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_dirty:
+                self._batch_dirty = False
+                self._save()
+
     def load(self) -> None:
         """Re-read the on-disk history file (useful after external writes)."""
         self._load()
@@ -55,31 +123,99 @@ class HistoryStore:
     def _load(self) -> None:
         try:
             if self.history_file.exists():
-                data = json.loads(self.history_file.read_text(encoding="utf-8"))
-                self.recent_roots = [
-                    r for r in data.get("recent_root_dirs", []) if Path(r).is_dir()
-                ]
-                valid_proxies: list[str] = []
-                seen: set[str] = set()
-                for proxy in data.get("recent_proxies", []):
-                    if validate_proxy_url(proxy) is None:
-                        n = normalize_proxy_url(proxy)
-                        if n not in seen:
-                            seen.add(n)
-                            valid_proxies.append(n)
-                self.recent_proxies = valid_proxies
+                key = str(self.history_file)
+                st = os.stat(self.history_file)
+                with _HISTORY_CACHE_LOCK:
+                    cached = _HISTORY_CACHE.get(key)
+                if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+                    # Entries were already filtered when they were cached
+                    self._set_document(cached[2], cached[3])
+                    return
+                raw = self.history_file.read_bytes()
+                data = _loads(raw)
+                # Roots are not stat'ed here (a dead network mount would stall
+                # startup); callers check the one the user actually picks.
+                # Relative entries (hand-edited or legacy) are dropped, so a
+                # picked root is always stored resolved.
+                data["recent_root_dirs"] = [
+                    r
+                    for r in data.get("recent_root_dirs", [])
+                    if isinstance(r, str) and os.path.isabs(r)
+                ][:10]
+                # Proxies are validated before add_proxy stores them, and
+                # set_proxy re-validates whatever the user picks, so no
+                # per-entry parsing here.
+                data["recent_proxies"] = [
+                    p for p in data.get("recent_proxies", []) if isinstance(p, str)
+                ][:10]
+                self._set_document(data, raw)
+                self._update_cache()
         except Exception as e:
             logger.debug(f"Failed to load history: {e}")
 
     def _save(self) -> None:
+        if self._batch_depth:
+            self._batch_dirty = True
+            return
         try:
-            existing: dict = {}
-            if self.history_file.exists():
-                existing = json.loads(self.history_file.read_text(encoding="utf-8"))
-            existing["recent_root_dirs"] = self.recent_roots[:10]
-            existing["recent_proxies"] = self.recent_proxies[:10]
-            self.history_file.write_text(
-                json.dumps(existing, indent=2), encoding="utf-8"
-            )
+            self._data["recent_root_dirs"] = self.recent_roots[:10]
+            self._data["recent_proxies"] = self.recent_proxies[:10]
+            payload = _dumps(self._data)
+            if payload == self._last_serialized:
+                # e.g. re-selecting the root that is already first in the list
+                return
+            self._write_atomic(payload)
+            self._last_serialized = payload
+            self._update_cache()
         except Exception as e:
             logger.debug(f"Failed to save history: {e}")
+
+    def _set_document(self, data: dict, serialized: bytes) -> None:
+        """Adopt *data* (already filtered) as the in-memory history."""
+        self._data = dict(data)
+        self.recent_roots = list(data.get("recent_root_dirs", []))
+        self.recent_proxies = list(data.get("recent_proxies", []))
+        self._last_serialized = serialized
+
+    def _write_atomic(self, payload: bytes) -> None:
+        """Write *payload* through a synced temp file and os.replace it in, so
+        a crash mid-write never leaves a truncated history file.
+
+        mkstemp creates the temp file as 0600, so it is given the existing
+        file's mode (or the umask default for a new file) before the replace.
+        """
+        try:
+            mode = stat.S_IMODE(os.stat(self.history_file).st_mode)
+        except FileNotFoundError:
+            mode = _default_file_mode()
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self.history_file.parent, prefix=".history-", suffix=".tmp"
+        )
+        tmp_path = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                if hasattr(os, "fchmod"):
+                    os.fchmod(tmp_file.fileno(), mode)
+                else:
+                    os.chmod(tmp_path, mode)  # platforms without fchmod
+                tmp_file.write(payload)
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+            os.replace(tmp_path, self.history_file)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def _update_cache(self) -> None:
+        """Record the in-memory document against the file's current stat."""
+        st = os.stat(self.history_file)
+        document = dict(self._data)
+        document["recent_root_dirs"] = list(self.recent_roots)
+        document["recent_proxies"] = list(self.recent_proxies)
+        with _HISTORY_CACHE_LOCK:
+            _HISTORY_CACHE[str(self.history_file)] = (
+                st.st_mtime_ns,
+                st.st_size,
+                document,
+                self._last_serialized,
+            )
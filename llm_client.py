@@ -37,6 +37,10 @@ class LLMClient:
         self.current_model = None
         self.current_model_config = None
         self.session_logger = session_logger
+        # Background save of the user turn, overlapping the HTTP request
+        self._pending_save: threading.Thread | None = None
+        # Its failure, reported on the main thread once the save is joined
+        self._pending_save_error: Exception | None = None
         self.api_key: str | None = None
         self.api_base_url: str | None = None
 
@@ -485,8 +489,8 @@ class LLMClient:
                 }
             )
 
-            if self.session_logger:
-                self.session_logger.save_session(self.conversation_history)
+            # The user turn is written while the request is in flight
+            self._persist_conversation(background=True)
 
             # Get response + usage from API
             response_text, usage = self._send_message_via_httpx(on_progress=on_progress)
@@ -500,30 +504,64 @@ class LLMClient:
                 }
             )
 
-            if self.session_logger:
-                self.session_logger.save_session(self.conversation_history)
+            self._persist_conversation()
 
             return response_text, usage
 
         except KeyboardInterrupt:
             print(f"\n{t('info.request_interrupted')}")
+            self._wait_for_pending_save()
             if (
                 self.conversation_history
                 and self.conversation_history[-1]["role"] == "user"
             ):
                 self.conversation_history.pop()
-                if self.session_logger:
-                    self.session_logger.save_session(self.conversation_history)
+                self._persist_conversation()
             return "", None
 
         except Exception as e:
-            if self.session_logger:
-                self.session_logger.save_session(self.conversation_history)
+            self._persist_conversation()
             return (
                 t("errors.error_communicating", model=self.current_model, error=e),
                 None,
             )
 
+    def _persist_conversation(self, background: bool = False) -> None:
+        """Save the conversation through the session logger, if any.
+
+        With *background*, a snapshot is saved on a worker thread; every
+        later save waits for it first, so writes never interleave.
+        """
+        if not self.session_logger:
+            return
+        self._wait_for_pending_save()
+        if background:
+            self._pending_save = threading.Thread(
+                target=self._save_in_background,
+                args=(self.session_logger, list(self.conversation_history)),
+                daemon=True,
+            )
+            self._pending_save.start()
+        else:
+            self.session_logger.save_session(self.conversation_history)
+
+    def _save_in_background(self, session_logger, history: list) -> None:
+        """Worker for background saves: an error is kept for
+        _wait_for_pending_save instead of being printed over the response
+        that is streaming meanwhile."""
+        try:
+            session_logger.save_session(history, raise_errors=True)
+        except Exception as e:
+            self._pending_save_error = e
+
+    def _wait_for_pending_save(self) -> None:
+        if self._pending_save is not None:
+            self._pending_save.join()
+            self._pending_save = None
+            error, self._pending_save_error = self._pending_save_error, None
+            if error is not None:
+                print(t("errors.error_saving_session", error=error))
+
     def generate(self, instruction: str) -> str | None:
         """Send a one-off instruction appended to the full conversation history.
 
@@ -560,8 +598,7 @@ class LLMClient:
     def load_conversation(self, conversation_history: list):
         """Load a saved conversation history."""
         self.conversation_history = conversation_history
-        if self.session_logger:
-            self.session_logger.save_session(self.conversation_history)
+        self._persist_conversation()
 
     def get_current_model(self) -> str | None:
         """Return currently active model name."""
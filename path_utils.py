@@ -1,7 +1,6 @@
 """Centralized file path resolution utilities."""
 
 import os
-from pathlib import Path
 
 
 def resolve_path(path: str, root_dir: str | None = None) -> str:
@@ -15,12 +14,14 @@ def resolve_path(path: str, root_dir: str | None = None) -> str:
     Returns:
         Resolved absolute path string
     """
-    path_obj = Path(path).expanduser()
+    # Plain os.path string operations: Path.resolve() is os.path.realpath()
+    # plus several intermediate Path objects, and this runs per context file.
+    path = os.path.expanduser(os.fspath(path))
 
-    if not path_obj.is_absolute() and root_dir:
-        path_obj = Path(root_dir) / path_obj
+    if not os.path.isabs(path) and root_dir:
+        path = os.path.join(root_dir, path)
 
     try:
-        return str(path_obj.resolve())
+        return os.path.realpath(path)
     except (OSError, RuntimeError, ValueError):
-        return os.path.abspath(str(path_obj))
+        return os.path.abspath(path)
@@ -1,10 +1,10 @@
 """SOCKS5 proxy wrapper for routing LLM client's API traffic"""
 
+import functools
 import importlib.util
 import logging
 from urllib.parse import urlparse
 
-import requests
 import socks
 
 logger = logging.getLogger(__name__)
@@ -128,6 +128,10 @@ class SOCKSProxyWrapper(ProxyWrapper):
 
     def _probe_connection(self):
         """Probe connectivity through the proxy (best-effort)."""
+        # Imported here: requests is only needed for this probe and is
+        # costly to load on every startup.
+        import requests
+
         try:
             proxy_url = self.proxy_config.get_proxy_url()
             logger.debug(f"Testing proxy connection: {proxy_url}")
@@ -228,10 +232,12 @@ def create_proxy_wrapper(proxy_url=None):
     return SimpleProxyWrapper(proxy_url)
 
 
+@functools.lru_cache(maxsize=64)
 def validate_proxy_url(proxy_url: str) -> str | None:
     """Validate proxy URL format. Returns None if valid, else error message.
 
-    Now gracefully accepts and normalizes trailing slashes.
+    Now gracefully accepts and normalizes trailing slashes. Results are
+    cached: startup and /proxy validate the same few URLs repeatedly.
     """
     if not proxy_url:
         return None
@@ -2,6 +2,7 @@
 
 import os
 import re
+import tomllib
 import zipfile
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -13,6 +14,20 @@ from strings import t
 
 CONVERSATION_NAME_MAX_WORDS = 12
 
+# Session path → ((st_ino, st_mtime_ns, st_ctime_ns, st_size), metadata);
+# saved sessions rarely change, so repeated /reload listings skip unzipping and
+# parsing them. Inode and ctime catch same-size rewrites within the mtime
+# resolution. Bounded so deleted or renamed sessions do not pile up; the limit
+# is well above a typical listing so a full /reload still fits.
+_METADATA_CACHE: dict[str, tuple[tuple[int, int, int, int], dict]] = {}
+_METADATA_CACHE_MAXSIZE = 1024
+
+# save_session writes [metadata] first, so everything before this marker is
+# the metadata table; no string value can contain it since only message
+# content is written as multi-line strings
+_HISTORY_MARKER = b"\n[[conversation_history]]"
+_HEAD_CHUNK_SIZE = 16 * 1024
+
 
 def sanitize_conversation_name(raw: str) -> tuple[str | None, str | None]:
     """Validate and normalize a conversation name.
@@ -38,6 +53,32 @@ def sanitize_conversation_name(raw: str) -> tuple[str | None, str | None]:
     return None, "-".join(tokens)
 
 
+def _read_head(f) -> bytes:
+    """Read *f* in chunks up to the first conversation_history entry."""
+    head = bytearray()
+    while chunk := f.read(_HEAD_CHUNK_SIZE):
+        start = max(0, len(head) - len(_HISTORY_MARKER))
+        head += chunk
+        cut = head.find(_HISTORY_MARKER, start)
+        if cut != -1:
+            del head[cut:]
+            break
+    return bytes(head)
+
+
+def _loads_fast(text: str):
+    """Parse session TOML for reading only.
+
+    tomllib is a couple of orders of magnitude faster than tomlkit on long
+    conversations, but it normalizes CRLF and rejects a lone CR inside
+    strings, which tomlkit round-trips; fall back to tomlkit for those.
+    """
+    try:
+        return tomllib.loads(text)
+    except tomllib.TOMLDecodeError:
+        return tomlkit.loads(text)
+
+
 class SessionLogger:
     def __init__(self, script_directory, root_dir):
         self.script_directory = script_directory
@@ -57,6 +98,9 @@ class SessionLogger:
             self._ts_str = self.session_start_time.strftime("%Y%m%d_%H%M%S")
         self.session_filename = f"session_{self._ts_str}.toml.zip"
         self.session_path = os.path.join(self.conversation_dir, self.session_filename)
+        # Rendered [[conversation_history]] entries, in order, each keyed by
+        # (timestamp, role, content); saves only render messages added since
+        self._rendered_messages: list[tuple[tuple[str, str, str], str]] = []
 
     def _get_conversation_dir(self):
         """Get the conversation directory for the current root_dir"""
@@ -91,10 +135,12 @@ class SessionLogger:
             os.replace(old_path, self.session_path)
         return self.session_path
 
-    def save_session(self, conversation_history):
+    def save_session(self, conversation_history, *, raise_errors=False):
         """
         Save conversation history to a zipped TOML file with multi-line literal strings for readable content.
         Empty conversations are never persisted.
+        Errors are printed unless *raise_errors* is set, in which case they
+        propagate (for callers saving off the main thread).
         """
         if not conversation_history:
             return None
@@ -123,23 +169,11 @@ class SessionLogger:
             metadata.add("name", self.session_name or "")
             doc.add("metadata", metadata)
 
-            conv_array = tomlkit.aot()
-
-            for msg in conversation_history:
-                msg_table = tomlkit.table()
-                msg_table.add("timestamp", msg["timestamp"])
-                msg_table.add("role", msg["role"])
-
-                content = msg["content"].replace("\\n", "\n")
-                content_item = tomlkit.string(content, literal=True, multiline=True)
-
-                msg_table.add("content", content_item)
-
-                conv_array.append(msg_table)
-
-            doc.add("conversation_history", conv_array)
-
-            toml_str = tomlkit.dumps(doc)
+            # Same text tomlkit produces for the whole document, but earlier
+            # messages reuse their rendering from the previous save.
+            toml_str = "\n".join(
+                [tomlkit.dumps(doc)] + self._render_messages(conversation_history)
+            )
 
             with zipfile.ZipFile(
                 self.session_path, "w", compression=zipfile.ZIP_DEFLATED
@@ -149,17 +183,61 @@ class SessionLogger:
             return self.session_path
 
         except Exception as e:
+            if raise_errors:
+                raise
             print(t("errors.error_saving_session", error=e))
             return None
 
+    def _render_messages(self, conversation_history):
+        """Return the TOML text of each message, rendering only new or
+        changed ones."""
+        rendered = self._rendered_messages
+        del rendered[len(conversation_history) :]
+        for i, msg in enumerate(conversation_history):
+            key = (msg["timestamp"], msg["role"], msg["content"])
+            if i < len(rendered) and rendered[i][0] == key:
+                continue
+            entry = (key, self._render_message(msg))
+            if i < len(rendered):
+                rendered[i] = entry
+            else:
+                rendered.append(entry)
+        return [text for _, text in rendered]
+
+    @staticmethod
+    def _render_message(msg):
+        """Render one message as a ``[[conversation_history]]`` entry."""
+        msg_table = tomlkit.table()
+        msg_table.add("timestamp", msg["timestamp"])
+        msg_table.add("role", msg["role"])
+
+        content = msg["content"].replace("\\n", "\n")
+        content_item = tomlkit.string(content, literal=True, multiline=True)
+
+        msg_table.add("content", content_item)
+
+        conv_array = tomlkit.aot()
+        conv_array.append(msg_table)
+        doc = tomlkit.document()
+        doc.add("conversation_history", conv_array)
+        return tomlkit.dumps(doc)
+
     def load_session(self, zip_path):
         """
         Load session from a zipped TOML file.
         """
+        return self._read_session(zip_path, tomlkit.loads)
+
+    def _read_session(self, zip_path, loads, head_only=False):
+        """Unzip and parse a session file with *loads*; report errors.
+
+        With *head_only*, decompress and parse only the metadata ahead of the
+        first message.
+        """
         try:
             with zipfile.ZipFile(zip_path, "r") as zipf, zipf.open("session.toml") as f:
-                toml_bytes = f.read()
-                session_data = tomlkit.loads(toml_bytes.decode("utf-8"))
+                toml_bytes = _read_head(f) if head_only else f.read()
+                session_data = loads(toml_bytes.decode("utf-8"))
 
             return session_data
 
@@ -174,8 +252,19 @@ class SessionLogger:
         """
         Load only metadata from a session zip file.
         Returns a dict with metadata fields, or None if failed.
+        Results are cached per path until the file changes on disk.
         """
-        session_data = self.load_session(zip_path)
+        try:
+            st = os.stat(zip_path)
+        except OSError:
+            key = None  # let _read_session report it
+        else:
+            key = (st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size)
+            cached = _METADATA_CACHE.get(zip_path)
+            if cached and cached[0] == key:
+                return dict(cached[1])
+
+        session_data = self._read_session(zip_path, _loads_fast, head_only=True)
         if not session_data or "metadata" not in session_data:
             return None
 
@@ -192,6 +281,14 @@ class SessionLogger:
         except (KeyError, TypeError, AttributeError):
             # If metadata is malformed, return partial data
             pass
+        if key is not None:
+            if (
+                zip_path not in _METADATA_CACHE
+                and len(_METADATA_CACHE) >= _METADATA_CACHE_MAXSIZE
+            ):
+                # Oldest entry out
+                _METADATA_CACHE.pop(next(iter(_METADATA_CACHE)))
+            _METADATA_CACHE[zip_path] = (key, dict(result))
         return result
 
     def get_session_path(self):
@@ -200,12 +297,18 @@ class SessionLogger:
 
     def list_available_sessions(self):
         """List all available session files for the current root_dir"""
-        sessions = []
-        if os.path.exists(self.conversation_dir):
-            for file in os.listdir(self.conversation_dir):
-                if file.endswith(".toml.zip"):
-                    file_path = os.path.join(self.conversation_dir, file)
-                    sessions.append(file_path)
+        try:
+            # One directory read; DirEntry.is_file() needs no extra stat on
+            # Linux, and a missing (or unreadable) directory just means no
+            # sessions to offer.
+            with os.scandir(self.conversation_dir) as entries:
+                sessions = [
+                    entry.path
+                    for entry in entries
+                    if entry.name.endswith(".toml.zip") and entry.is_file()
+                ]
+        except OSError:
+            return []
         return sorted(sessions, reverse=True)  # Most recent first
 
     def get_interaction_count(self):
@@ -14,6 +14,9 @@ from pathlib import Path
 
 _STRINGS = None
 
+# Rendered result of argument-free lookups (constant once strings.json is loaded)
+_RENDERED: dict[str, str] = {}
+
 
 def _load() -> dict:
     """Load strings.json once and cache it."""
@@ -30,7 +33,15 @@ def t(key: str, **kwargs) -> str:
     Entries may be either a plain string or an object with
     "text" and optional "color" fields. Placeholders ({name}) are
     replaced using str.format with the given kwargs.
+
+    Lookups without kwargs (prefixes, separators, headers) are memoized so
+    the per-turn chrome is not re-colorized on every call.
     """
+    if not kwargs:
+        cached = _RENDERED.get(key)
+        if cached is not None:
+            return cached
+
     entry = _load()
     for part in key.split("."):
         entry = entry[part]
@@ -48,5 +59,8 @@ def t(key: str, **kwargs) -> str:
     if color:
         from ui import UI  # local import to avoid circular dependency
 
-        return UI.colorize(text, color)
+        text = UI.colorize(text, color)
+
+    if not kwargs:
+        _RENDERED[key] = text
     return text
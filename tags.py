@@ -33,17 +33,15 @@ class Xml:
         """Generate closing tag."""
         return f"</{tag}>"
 
-    @staticmethod
-    def section_pattern(tag: str) -> str:
-        """Regex pattern to extract content from a section tag (tolerant to attributes and whitespace)."""
-        return rf"<{tag}\b[^>]*>([\s\S]*?)</{tag}>"
-
     @staticmethod
     def file_pattern(tag: str) -> str:
         """Regex pattern to extract path and content from a file tag (tolerant to whitespace around attributes)."""
         return rf"<{tag}\b[^>]*\s*path\s*=\s*\"([^\"]+)\"\s*>([\s\S]*?)</{tag}>"
 
     @staticmethod
-    def removal_pattern(tag: str) -> str:
-        """Regex pattern to remove an entire section (including its content) for extraneous content cleanup."""
-        return rf"<{tag}\b[^>]*>[\s\S]*?</{tag}>"
+    def sections_pattern(*tags: str) -> str:
+        """Regex pattern matching an entire section of any of the given tags: group 1 is the tag, group 2 its content.
+
+        Lets a response be split into its sections and the extraneous text around them in one scan.
+        """
+        return rf"<({'|'.join(tags)})\b[^>]*>([\s\S]*?)</\1>"
@@ -106,6 +106,27 @@ def test_config_missing_required_fields():
         os.unlink(config_path)
 
 
+def test_config_reports_all_missing_fields():
+    """Test that every missing required field is named in one error."""
+    invalid_config = {"models": {"bare-model": {"model": "m"}}}
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+        json.dump(invalid_config, f)
+        config_path = f.name
+
+    try:
+        config.set_config_path(config_path)
+        try:
+            config.get_models()
+            raise AssertionError("Should have raised ValueError for missing fields")
+        except ValueError as e:
+            assert "'api_key', 'api_base_url'" in str(e)
+            assert "'model'" not in str(e)
+            print("Correctly reports all missing fields")
+    finally:
+        os.unlink(config_path)
+
+
 def test_config_invalid_proxy_type():
     """Test that config validation rejects non-boolean proxy field."""
     invalid_config = {
@@ -288,6 +309,7 @@ def test_config_advanced_model_fields():
 if __name__ == "__main__":
     test_config_validation()
     test_config_missing_required_fields()
+    test_config_reports_all_missing_fields()
     test_config_invalid_proxy_type()
     test_config_backup_strict_validation()
     test_config_reloading()
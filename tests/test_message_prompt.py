@@ -18,7 +18,11 @@ MESSAGE_LINE = t("prompts.input_hint").rstrip("\n")
 
 
 def _chat():
-    return LLMChat.__new__(LLMChat)
+    chat = LLMChat.__new__(LLMChat)
+    # The render caches __init__ would have set up
+    chat._files_line_cache = {}
+    chat._context_block_cache = None
+    return chat
 
 
 def test_print_message_prompt_is_only_the_separator(capsys):
@@ -62,6 +66,41 @@ def test_file_context_block_none_value_default_color(capsys):
     assert "\x1b[32mReadable (1):\x1b[0m notes.md" in block
 
 
+def test_file_context_block_tracks_in_place_list_changes():
+    chat = _chat()
+    chat.editable_files = ["/proj/hello.s"]
+    chat.readable_files = []
+    chat.root_dir = "/proj"
+    assert "Editable (1):" in chat._file_context_block()
+    # The file menu mutates the same list objects in place
+    chat.editable_files.append("/proj/main.c")
+    block = chat._file_context_block()
+    assert "Editable (2):" in block
+    assert "main.c" in block
+    chat.root_dir = "/"
+    assert "proj/hello.s" in chat._file_context_block()
+
+
+def test_file_context_block_reused_between_renders():
+    chat = _chat()
+    chat.editable_files = ["/proj/hello.s"]
+    chat.readable_files = []
+    chat.root_dir = "/proj"
+    first = chat._file_context_block()
+    with patch("thin_wrap.UI.colorize") as colorize:
+        assert chat._file_context_block() is first
+    colorize.assert_not_called()
+
+
+def test_files_line_relative_paths_inside_and_outside_root():
+    chat = _chat()
+    chat.root_dir = "/proj"
+    _, value = chat._build_files_line(["/proj/src/a.py", "/project2/b.py"], "Editable")
+    assert value == "src/a.py, ../project2/b.py"
+    chat.root_dir = "/"
+    assert chat._build_files_line(["/proj/a.py"], "Editable")[1] == "proj/a.py"
+
+
 def test_file_context_block_empty_when_no_files():
     chat = _chat()
     chat.editable_files = []
@@ -135,7 +135,21 @@ def test_proxy_command_parsing():
     print("Proxy command parsing test passed")
 
 
+def test_validate_proxy_url_cached():
+    """Test that repeated validation of the same URL hits the cache."""
+    from proxy_wrapper import validate_proxy_url
+
+    validate_proxy_url.cache_clear()
+    assert validate_proxy_url("socks5://127.0.0.1:1080") is None
+    assert validate_proxy_url("socks5://127.0.0.1:1080") is None
+    assert validate_proxy_url.cache_info().hits == 1
+    assert "Unsupported proxy scheme" in validate_proxy_url("ftp://host:21")
+
+    print("Proxy validation cache test passed")
+
+
 if __name__ == "__main__":
     test_proxy_history()
     test_proxy_command_parsing()
+    test_validate_proxy_url_cached()
     print("\nAll proxy tests passed!")
@@ -8,12 +8,15 @@ import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import config
 from command_handler import CommandHandler
 from file_processor import _report_diff, _write_file, generate_query
 from history_store import HistoryStore
+from text_utils import clean_text
 from thin_wrap import LLMChat
 from ui import UI
 
@@ -42,6 +45,24 @@ def test_history_store_round_trip():
         shutil.rmtree(tmp, ignore_errors=True)
 
 
+def test_history_store_drops_relative_roots():
+    tmp = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        os.chdir(tmp)
+        os.makedirs("proj")
+        hf = Path(tmp) / "history.json"
+        hf.write_text(json.dumps({"recent_root_dirs": [".", "proj", tmp]}))
+        store = HistoryStore(hf)
+        assert store.recent_roots == [tmp]
+
+        store.add_root("proj", already_resolved=True)
+        assert store.recent_roots[0] == str(Path(tmp, "proj").resolve())
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
 def test_history_store_preserves_both_keys():
     tmp = tempfile.mkdtemp()
     try:
@@ -59,6 +80,109 @@ def test_history_store_preserves_both_keys():
         shutil.rmtree(tmp, ignore_errors=True)
 
 
+def test_history_store_add_proxy_dedupes_and_caps():
+    tmp = tempfile.mkdtemp()
+    try:
+        hf = Path(tmp) / "history.json"
+        hf.write_text(
+            json.dumps(
+                {
+                    "recent_proxies": ["socks5://a:1/"]
+                    + [f"socks5://p:{i}" for i in range(9)]
+                }
+            )
+        )
+        store = HistoryStore(hf)
+        store.add_proxy("socks5://p:3")
+        store.add_proxy("socks5://a:1/")
+        assert store.recent_proxies[:3] == [
+            "socks5://a:1",
+            "socks5://p:3",
+            "socks5://p:0",
+        ]
+        assert len(store.recent_proxies) == 10
+        assert len(set(store.recent_proxies)) == 10
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def test_history_store_keeps_unknown_keys():
+    tmp = tempfile.mkdtemp()
+    try:
+        hf = Path(tmp) / "history.json"
+        hf.write_text(json.dumps({"recent_root_dirs": [], "future_key": [1, 2]}))
+        store = HistoryStore(hf)
+        store.add_root(tmp)
+        raw = json.loads(hf.read_text())
+        assert raw["future_key"] == [1, 2], "keys owned by others must survive"
+        assert raw["recent_root_dirs"] == [str(Path(tmp).resolve())]
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def test_history_store_cache_sees_external_writes():
+    tmp = tempfile.mkdtemp()
+    try:
+        hf = Path(tmp) / "history.json"
+        store = HistoryStore(hf)
+        store.add_proxy("socks5://127.0.0.1:1080")
+        assert HistoryStore(hf).recent_proxies == ["socks5://127.0.0.1:1080"]
+        hf.write_text(json.dumps({"recent_proxies": ["http://proxy.example:8080"]}))
+        assert HistoryStore(hf).recent_proxies == ["http://proxy.example:8080"], (
+            "rewritten file must invalidate the cached entry"
+        )
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def test_history_store_skips_unchanged_write():
+    tmp = tempfile.mkdtemp()
+    try:
+        hf = Path(tmp) / "history.json"
+        store = HistoryStore(hf)
+        store.add_root(tmp)
+        os.utime(hf, ns=(0, 0))
+        store.add_root(tmp)
+        assert os.stat(hf).st_mtime_ns == 0, "same content must not be rewritten"
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def test_history_store_batch_writes_once():
+    tmp = tempfile.mkdtemp()
+    try:
+        hf = Path(tmp) / "history.json"
+        store = HistoryStore(hf)
+        with patch.object(store, "_write_atomic", wraps=store._write_atomic) as w:
+            with store.batch():
+                store.add_root(tmp)
+                store.add_proxy("socks5://127.0.0.1:1080")
+                assert not hf.exists(), "nothing written inside the batch"
+            assert w.call_count == 1
+        reloaded = HistoryStore(hf)
+        assert reloaded.recent_proxies == ["socks5://127.0.0.1:1080"]
+        assert reloaded.recent_roots == [str(Path(tmp).resolve())]
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def test_history_store_write_keeps_file_mode():
+    tmp = tempfile.mkdtemp()
+    try:
+        hf = Path(tmp) / "history.json"
+        store = HistoryStore(hf)
+        store.add_root(tmp)
+        umask = os.umask(0)
+        os.umask(umask)
+        assert hf.stat().st_mode & 0o777 == 0o666 & ~umask
+
+        hf.chmod(0o640)
+        store.add_proxy("socks5://127.0.0.1:1080")
+        assert hf.stat().st_mode & 0o777 == 0o640
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
 # =========================================================================
 # command_handler._handle_rootdir (was str.is_dir crash)
 # =========================================================================
@@ -69,8 +193,8 @@ class _MockChatApp:
     recent_roots: list[str] = []
     recent_proxies: list[str] = []
 
-    def set_root_dir(self, path):  # pragma: no cover
-        pass
+    def set_root_dir(self, path, ask_to_reload=True, *, already_resolved=False):
+        self.last_root = (path, already_resolved)
 
     def set_proxy(self, url: str | None):  # pragma: no cover
         return True
@@ -86,6 +210,62 @@ def test_handle_rootdir_with_path_arg(tmp_path):
     )
     handler._handle_rootdir([str(tmp_path)])
     # should not raise AttributeError (was: str.is_dir)
+    assert chat.last_root == (str(tmp_path.resolve()), True), "validated once"
+
+
+def test_handle_rootdir_stale_recent_root_is_dropped(tmp_path):
+    chat = MagicMock()
+    handler = CommandHandler(
+        llm_client=MagicMock(),
+        session_logger=MagicMock(),
+        input_handler=MagicMock(),
+        chat_app=chat,
+    )
+    stale = str(tmp_path / "gone")
+    with patch.object(
+        UI,
+        "numbered_selection",
+        side_effect=[("item", stale), ("item", str(tmp_path))],
+    ):
+        handler._handle_rootdir([])
+    chat.reject_recent_root.assert_called_once_with(stale)
+    chat.set_root_dir.assert_called_once_with(str(tmp_path), already_resolved=True)
+
+
+def test_handle_command_dispatch_covers_all_commands():
+    dispatched = set(CommandHandler._DISPATCH) | {"/bye"}
+    assert dispatched == set(config.COMMANDS), "every /help entry must dispatch"
+    with pytest.raises(TypeError):
+        config.COMMANDS["/new"] = "not listed by the cached /help text"
+
+    handler = CommandHandler(
+        llm_client=MagicMock(),
+        session_logger=MagicMock(),
+        input_handler=MagicMock(),
+        chat_app=MagicMock(),
+    )
+    assert handler.handle_command("/BYE") is True
+    with patch.object(CommandHandler, "_DISPATCH", {"/x": (MagicMock(), True)}):
+        assert handler.handle_command("/x a b") is False
+        assert handler.handle_command("/X") is False
+        x_handler = CommandHandler._DISPATCH["/x"][0]
+        assert x_handler.call_args_list[0].args == (handler, ["a", "b"])
+        assert x_handler.call_args_list[1].args == (handler, [])
+
+
+def test_help_lists_every_command(capsys):
+    handler = CommandHandler(
+        llm_client=MagicMock(),
+        session_logger=MagicMock(),
+        input_handler=MagicMock(),
+        chat_app=MagicMock(),
+    )
+    handler.handle_command("/help")
+    first = capsys.readouterr().out
+    for cmd in config.COMMANDS:
+        assert cmd in first
+    handler.handle_command("/help")
+    assert capsys.readouterr().out == first
 
 
 # =========================================================================
@@ -173,12 +353,41 @@ def test_report_diff_no_changes():
     # should print no_changes
 
 
+def test_git_stat_diff_counts_lines_that_look_like_headers():
+    from file_processor import _compute_git_stat_diff
+
+    assert _compute_git_stat_diff("a\nb\nc\n", "a\nx\nc\nd\n") == (2, 1)
+    assert _compute_git_stat_diff("--flag\nkeep\n", "keep\n++x\n") == (1, 1)
+
+
 def test_write_file_atomic_and_creates_dirs(tmp_path):
     target = tmp_path / "deep" / "nest" / "file.txt"
     _write_file(target, "payload", preserve_permissions_from=None)
     assert target.read_text() == "payload"
 
 
+def test_write_file_can_skip_mkdir_for_existing_parent(tmp_path):
+    target = tmp_path / "file.txt"
+    target.write_text("old")
+    with patch.object(Path, "mkdir", side_effect=AssertionError("mkdir")):
+        _write_file(target, "new", preserve_permissions_from=target, make_parents=False)
+    assert target.read_text() == "new"
+
+
+def test_write_file_copies_source_permissions(tmp_path):
+    source = tmp_path / "script.sh"
+    source.write_text("old")
+    source.chmod(0o751)
+    _write_file(source, "new", preserve_permissions_from=source)
+    assert source.read_text() == "new"
+    assert source.stat().st_mode & 0o7777 == 0o751
+    assert [p.name for p in tmp_path.iterdir()] == ["script.sh"]
+
+    missing = tmp_path / "gone.sh"
+    _write_file(tmp_path / "other.sh", "x", preserve_permissions_from=missing)
+    assert (tmp_path / "other.sh").read_text() == "x"
+
+
 # =========================================================================
 # generate_query force_plain
 # =========================================================================
@@ -191,6 +400,168 @@ def test_generate_query_force_plain():
     # free-chat path yields plain query without prompting
 
 
+def test_generate_query_reads_files_with_universal_newlines(tmp_path):
+    (tmp_path / "crlf.txt").write_bytes("caf\u00e9\r\nline\rend".encode())
+    query, _ = generate_query(str(tmp_path), ["crlf.txt", "missing.txt"], [], "hi")
+    assert "caf\u00e9\nline\nend" in query
+    assert "\r" not in query
+    assert 'path="missing.txt">\n[Error reading file: Error reading file' in query
+
+
+def test_generate_query_reads_without_realpath(tmp_path):
+    (tmp_path / "rel.txt").write_text("relative\n", encoding="utf-8")
+    (tmp_path / "abs.txt").write_text("absolute\n", encoding="utf-8")
+    with patch("os.path.realpath", side_effect=AssertionError("realpath")):
+        query, _ = generate_query(
+            str(tmp_path), ["rel.txt"], [str(tmp_path / "abs.txt")], "hi"
+        )
+    assert "relative\n" in query
+    assert "absolute\n" in query
+
+
+def test_generate_query_keeps_file_order_with_concurrent_reads(tmp_path):
+    names = [f"f{i}.txt" for i in range(20)]
+    for name in names:
+        (tmp_path / name).write_text(f"body of {name}\n", encoding="utf-8")
+    query, _ = generate_query(str(tmp_path), names[:10], names[10:], "hi")
+    positions = [query.index(f"body of {name}") for name in names]
+    assert positions == sorted(positions)
+
+
+def test_generate_query_rereads_only_changed_files(tmp_path):
+    import file_processor
+
+    path = tmp_path / "ctx.txt"
+    path.write_text("first\n", encoding="utf-8")
+    query, _ = generate_query(str(tmp_path), ["ctx.txt"], [], "hi")
+    assert "first\n" in query
+
+    with patch.object(file_processor, "_read_bytes", side_effect=AssertionError):
+        query, _ = generate_query(str(tmp_path), ["ctx.txt"], [], "hi")
+    assert "first\n" in query
+
+    path.write_text("second, longer\n", encoding="utf-8")
+    query, _ = generate_query(str(tmp_path), ["ctx.txt"], [], "hi")
+    assert "second, longer\n" in query
+
+
+def test_generate_query_rereads_same_size_edit_with_restored_mtime(tmp_path):
+    path = tmp_path / "ctx.txt"
+    path.write_text("aaaa\n", encoding="utf-8")
+    before = path.stat()
+    generate_query(str(tmp_path), ["ctx.txt"], [], "hi")
+
+    # Same size, same mtime: only ctime (and possibly the inode) tells
+    path.write_text("bbbb\n", encoding="utf-8")
+    os.utime(path, ns=(before.st_atime_ns, before.st_mtime_ns))
+    query, _ = generate_query(str(tmp_path), ["ctx.txt"], [], "hi")
+    assert "bbbb\n" in query
+
+
+def test_file_cache_refresh_does_not_evict_other_entries(tmp_path):
+    import file_processor
+
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / name).write_text(name, encoding="utf-8")
+    with (
+        patch.dict(file_processor._FILE_CACHE, clear=True),
+        patch.object(file_processor, "_FILE_CACHE_MAXSIZE", 2),
+    ):
+        generate_query(str(tmp_path), ["a.txt", "b.txt"], [], "hi")
+        (tmp_path / "b.txt").write_text("b, edited", encoding="utf-8")
+        generate_query(str(tmp_path), ["b.txt"], [], "hi")
+        assert sorted(map(os.path.basename, file_processor._FILE_CACHE)) == [
+            "a.txt",
+            "b.txt",
+        ]
+
+
+def test_parse_xml_response_extracts_files_once(tmp_path):
+    import file_processor
+
+    target = tmp_path / "new.txt"
+    response = (
+        "<prompt_engineering_answer_new_files>"
+        f'<prompt_engineering_answer_new_file path="{target}">\nhello\n'
+        "</prompt_engineering_answer_new_file>"
+        "</prompt_engineering_answer_new_files>"
+        "<prompt_engineering_answer_comments>done</prompt_engineering_answer_comments>"
+    )
+    with (
+        patch("config.backup", return_value={"enabled": False}),
+        patch.object(
+            file_processor, "_extract_files", wraps=file_processor._extract_files
+        ) as extract,
+    ):
+        assert file_processor.parse_xml_response(response) == "done"
+    assert extract.call_count == 2
+    assert target.read_text(encoding="utf-8") == "hello\n"
+
+
+def test_parse_xml_response_reports_only_text_outside_sections(caplog):
+    import file_processor
+
+    response = (
+        "intro "
+        "<PROMPT_ENGINEERING_ANSWER_EDITED_FILES></prompt_engineering_answer_edited_files>"
+        " middle "
+        "<prompt_engineering_answer_comments>note</prompt_engineering_answer_comments>"
+        " outro"
+    )
+    with patch("config.backup", return_value={"enabled": False}):
+        assert file_processor.parse_xml_response(response) == "note"
+    assert "intro middle outro" in caplog.text
+    assert "note" not in caplog.text.split("Extraneous content")[-1]
+
+
+def test_parse_xml_response_ignores_section_tags_inside_file_content(tmp_path):
+    import file_processor
+
+    target = tmp_path / "doc.md"
+    target.write_text("old\n", encoding="utf-8")
+    body = "see <prompt_engineering_answer_comments>x</prompt_engineering_answer_comments>\n"
+    response = (
+        "<prompt_engineering_answer_edited_files>"
+        f'<prompt_engineering_answer_edited_file path="{target}">\n{body}'
+        "</prompt_engineering_answer_edited_file>"
+        "</prompt_engineering_answer_edited_files>"
+        "<prompt_engineering_answer_comments>real</prompt_engineering_answer_comments>"
+    )
+    with patch("config.backup", return_value={"enabled": False}):
+        assert file_processor.parse_xml_response(response) == "real"
+    assert target.read_text(encoding="utf-8") == body
+
+
+# =========================================================================
+# text_utils.clean_text
+# =========================================================================
+
+
+def test_clean_text_ascii_returned_as_is():
+    text = "plain ascii\n\twith tabs"
+    assert clean_text(text) is text
+
+
+def test_clean_text_still_replaces_typographic_chars():
+    assert clean_text("\u201chi\u201d \u2014 ok\u2026") == '"hi" -- ok...'
+    assert clean_text("caf\u00e9 \u2019".encode()) == "caf\u00e9 '"
+
+
+def test_estimate_tokens_cached_does_not_share_colliding_hashes():
+    from text_utils import estimate_tokens, estimate_tokens_cached
+
+    class _Colliding(str):
+        def __hash__(self):
+            return 42
+
+    short_words = _Colliding("a b c d e f g h i j k l m n o p")
+    one_word = _Colliding("abcdefghijklmnopqrstuvwxyzabcde")
+    assert len(short_words) == len(one_word)
+    assert estimate_tokens(short_words) != estimate_tokens(one_word)
+    assert estimate_tokens_cached(short_words) == estimate_tokens(short_words)
+    assert estimate_tokens_cached(one_word) == estimate_tokens(one_word)
+
+
 # =========================================================================
 # token-usage table (regression: wide cache-display overflow)
 # =========================================================================
@@ -252,6 +623,36 @@ def test_numbered_selection_zero_choice(mock_session_cls):
     assert v is None
 
 
+@patch("ui.PromptSession")
+def test_numbered_selection_formats_items_once(mock_session_cls, capsys):
+    mock_session = MagicMock()
+    mock_session.prompt.side_effect = ["", "9", "1"]
+    mock_session_cls.return_value = mock_session
+    formatter = MagicMock(side_effect=lambda x: f"<{x}>")
+
+    st, v = UI.numbered_selection(
+        items=["a", "b"], title="T", prompt="P", item_formatter=formatter
+    )
+    assert (st, v) == ("item", "a")
+    # once per item for the menu, once more for the "Selected:" echo
+    assert formatter.call_count == 3
+    assert capsys.readouterr().out.count("<b>") == 3, "menu re-shown on each retry"
+
+
+@patch("ui.PromptSession")
+def test_numbered_selection_signed_number_out_of_range(mock_session_cls, capsys):
+    mock_session = MagicMock()
+    mock_session.prompt.side_effect = ["-1", "+1"]
+    mock_session_cls.return_value = mock_session
+
+    with patch("ui.t", side_effect=lambda k, **kw: k):
+        st, v = UI.numbered_selection(
+            items=["a"], title="T", prompt="P", allow_manual=True
+        )
+    assert (st, v) == ("item", "a")
+    assert "common.number_out_of_range" in capsys.readouterr().out
+
+
 @patch("ui.PromptSession")
 def test_numbered_selection_manual_entry(mock_session_cls):
     mock_session = MagicMock()
@@ -298,6 +699,68 @@ def test_config_invalidate_clears_cache(tmp_path, monkeypatch):
         assert m1 is not m2, "invalidate should force re-read"
 
 
+def test_config_cache_reparses_same_mtime_size_change(tmp_path):
+    cf = tmp_path / "config.json"
+    _minimal_config_for_llmchat(str(cf))
+
+    with patch("config._CONFIG_PATH", str(cf)):
+        config.invalidate()
+        st = os.stat(cf)
+        assert set(config.get_models()) == {"t"}
+        data = json.loads(cf.read_text())
+        data["models"]["second"] = dict(data["models"]["t"])
+        cf.write_text(json.dumps(data))
+        # coarse-timestamp filesystems can leave mtime unchanged
+        os.utime(cf, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert set(config.get_models()) == {"t", "second"}
+        assert len(config._CONFIG_CACHE) == 1, "stale entries are replaced"
+
+
+def test_config_invalid_json_names_file(tmp_path):
+    cf = tmp_path / "config.json"
+    cf.write_text('{"models": ', encoding="utf-8")
+
+    config.invalidate()
+    with pytest.raises(json.JSONDecodeError, match="Invalid JSON in"):
+        config._load_config_internal(str(cf))
+
+
+def test_config_snapshot_loads_once(tmp_path):
+    cf = tmp_path / "config.json"
+    _minimal_config_for_llmchat(str(cf))
+
+    with patch("config._CONFIG_PATH", str(cf)):
+        config.invalidate()
+        with patch(
+            "config._load_config_internal", wraps=config._load_config_internal
+        ) as load:
+            with config.snapshot():
+                assert load.call_count == 0, "nothing read until first use"
+                models = config.get_models()
+                with config.snapshot():
+                    assert config.get_models() is models
+                assert config.backup() == {"enabled": False}
+            assert load.call_count == 1
+            config.get_models()
+            assert load.call_count == 2, "outside a snapshot every call loads"
+
+
+def test_config_data_dirs_built_on_first_access(tmp_path):
+    names = ("DATA_DIR", "CONVERSATIONS_DIR")
+    saved = {n: vars(config).pop(n) for n in names if n in vars(config)}
+    try:
+        with patch(
+            "platformdirs.user_data_dir", return_value=str(tmp_path)
+        ) as data_dir:
+            assert str(tmp_path / "conversations") == config.CONVERSATIONS_DIR
+            assert str(tmp_path) == config.DATA_DIR
+        data_dir.assert_called_once()
+    finally:
+        for n in names:
+            vars(config).pop(n, None)
+        vars(config).update(saved)
+
+
 # =========================================================================
 # /clear starts a fresh session while keeping the old one on disk
 # =========================================================================
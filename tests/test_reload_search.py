@@ -236,6 +236,21 @@ def test_reload_cancel_at_prompt():
         handler._handle_reload()  # should not raise
 
 
+def test_reload_formats_each_session_once():
+    """Redisplays and the final confirmation reuse the formatted rows."""
+    import command_handler
+
+    chat, handler = _make_handler()
+    with (
+        patch("builtins.input", side_effect=["", "9", "2"]),
+        patch.object(
+            command_handler, "format_session", wraps=command_handler.format_session
+        ) as fmt,
+    ):
+        handler._handle_reload()
+    assert fmt.call_count == 2
+
+
 def test_rank_sessions_sorts_by_score():
     """Ranking sorts by score descending (title beats content)."""
     chat = _MockChatApp()
@@ -306,6 +321,7 @@ if __name__ == "__main__":
     test_reload_blank_input_redraws_list()
     test_reload_whitespace_input_redraws_list()
     test_reload_cancel_at_prompt()
+    test_reload_formats_each_session_once()
     test_rank_sessions_sorts_by_score()
     test_rank_sessions_requires_all_keywords()
     test_search_formatter_includes_score_and_snippet()
@@ -5,6 +5,8 @@ import os
 import shutil
 import sys
 import tempfile
+import zipfile
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
@@ -235,9 +237,221 @@ def test_session_preview_truncation():
             shutil.rmtree(root_dir, ignore_errors=True)
 
 
+def test_save_session_renders_only_new_messages():
+    """Test that repeated saves reuse earlier message renderings."""
+    original = config.CONVERSATIONS_DIR
+    temp_dir = tempfile.mkdtemp()
+    config.CONVERSATIONS_DIR = temp_dir
+
+    try:
+        logger = SessionLogger(script_directory="/tmp", root_dir=None)
+        history = [
+            {"timestamp": "2025-01-01T00:00:00", "role": "user", "content": "Hi"},
+            {"timestamp": "2025-01-01T00:00:01", "role": "assistant", "content": "Yo"},
+        ]
+        logger.save_session(history)
+
+        history.append(
+            {"timestamp": "2025-01-01T00:00:02", "role": "user", "content": "More"}
+        )
+        with patch.object(
+            SessionLogger, "_render_message", wraps=SessionLogger._render_message
+        ) as render:
+            saved_path = logger.save_session(history)
+        assert render.call_count == 1
+
+        session = logger.load_session(saved_path)
+        contents = [m["content"] for m in session["conversation_history"]]
+        assert contents == ["Hi", "Yo", "More"]
+        assert session["metadata"]["interaction_count"] == 2
+
+    finally:
+        config.CONVERSATIONS_DIR = original
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_list_available_sessions_files_only_newest_first():
+    """Test that listing keeps session files only, most recent first."""
+    original = config.CONVERSATIONS_DIR
+    temp_dir = tempfile.mkdtemp()
+    config.CONVERSATIONS_DIR = temp_dir
+
+    try:
+        logger = SessionLogger(script_directory="/tmp", root_dir=None)
+        conv_dir = logger.conversation_dir
+        for name in (
+            "session_20250101_000000.toml.zip",
+            "session_20250102_000000.toml.zip",
+            "notes.txt",
+        ):
+            with open(os.path.join(conv_dir, name), "w") as f:
+                f.write("x")
+        os.mkdir(os.path.join(conv_dir, "session_bogus.toml.zip"))
+
+        assert logger.list_available_sessions() == [
+            os.path.join(conv_dir, "session_20250102_000000.toml.zip"),
+            os.path.join(conv_dir, "session_20250101_000000.toml.zip"),
+        ]
+
+        shutil.rmtree(conv_dir)
+        assert logger.list_available_sessions() == []
+
+        # Not a directory: no sessions rather than NotADirectoryError
+        with open(conv_dir, "w") as f:
+            f.write("x")
+        assert logger.list_available_sessions() == []
+
+    finally:
+        config.CONVERSATIONS_DIR = original
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_load_session_metadata_lone_carriage_return():
+    """Test that metadata still loads when content trips the fast parser."""
+    original = config.CONVERSATIONS_DIR
+    temp_dir = tempfile.mkdtemp()
+    config.CONVERSATIONS_DIR = temp_dir
+
+    try:
+        logger = SessionLogger(script_directory="/tmp", root_dir=None)
+        history = [
+            {"timestamp": "2025-01-01T00:00:00", "role": "user", "content": "a\rb"},
+        ]
+        saved_path = logger.save_session(history)
+        metadata = logger.load_session_metadata(saved_path)
+        assert metadata["interaction_count"] == 1
+        assert metadata["preview"] == "a b"
+
+    finally:
+        config.CONVERSATIONS_DIR = original
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_load_session_metadata_cached_until_file_changes():
+    """Test that metadata is re-read only after the session file changes."""
+    original = config.CONVERSATIONS_DIR
+    temp_dir = tempfile.mkdtemp()
+    config.CONVERSATIONS_DIR = temp_dir
+
+    try:
+        logger = SessionLogger(script_directory="/tmp", root_dir=None)
+        history = [
+            {"timestamp": "2025-01-01T00:00:00", "role": "user", "content": "One"},
+        ]
+        saved_path = logger.save_session(history)
+        assert logger.load_session_metadata(saved_path)["interaction_count"] == 1
+
+        with patch.object(logger, "_read_session") as read:
+            assert logger.load_session_metadata(saved_path)["preview"] == "One"
+        read.assert_not_called()
+
+        history.append(
+            {"timestamp": "2025-01-01T00:00:01", "role": "user", "content": "Two"}
+        )
+        logger.save_session(history)
+        assert logger.load_session_metadata(saved_path)["interaction_count"] == 2
+
+    finally:
+        config.CONVERSATIONS_DIR = original
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_load_session_metadata_reads_head_only():
+    """Test that metadata loading stops before the conversation entries."""
+    original = config.CONVERSATIONS_DIR
+    temp_dir = tempfile.mkdtemp()
+    config.CONVERSATIONS_DIR = temp_dir
+
+    try:
+        zip_path = os.path.join(temp_dir, "session_20250101_000000.toml.zip")
+        toml_text = (
+            "[metadata]\n"
+            'session_start_time = "2025-01-01T00:00:00"\n'
+            "interaction_count = 3\n"
+            'preview = "Hello"\n'
+            "\n[[conversation_history]]\n" + "not valid toml = = =\n" * 5000
+        )
+        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as z:
+            z.writestr("session.toml", toml_text.encode("utf-8"))
+
+        logger = SessionLogger(script_directory="/tmp", root_dir=None)
+        metadata = logger.load_session_metadata(zip_path)
+        assert metadata["interaction_count"] == 3
+        assert metadata["preview"] == "Hello"
+
+    finally:
+        config.CONVERSATIONS_DIR = original
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _write_session_zip(zip_path, preview):
+    toml_text = f'[metadata]\ninteraction_count = 1\npreview = "{preview}"\n'
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED) as z:
+        z.writestr(zipfile.ZipInfo("session.toml"), toml_text.encode("utf-8"))
+
+
+def test_load_session_metadata_rereads_same_size_rewrite():
+    """Test that a same-size rewrite with a restored mtime is not served stale."""
+    original = config.CONVERSATIONS_DIR
+    temp_dir = tempfile.mkdtemp()
+    config.CONVERSATIONS_DIR = temp_dir
+
+    try:
+        zip_path = os.path.join(temp_dir, "session_20250101_000000.toml.zip")
+        _write_session_zip(zip_path, "Hello")
+        before = os.stat(zip_path)
+        logger = SessionLogger(script_directory="/tmp", root_dir=None)
+        assert logger.load_session_metadata(zip_path)["preview"] == "Hello"
+
+        _write_session_zip(zip_path, "Howdy")
+        os.utime(zip_path, ns=(before.st_atime_ns, before.st_mtime_ns))
+        assert os.stat(zip_path).st_size == before.st_size
+        assert logger.load_session_metadata(zip_path)["preview"] == "Howdy"
+
+    finally:
+        config.CONVERSATIONS_DIR = original
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_load_session_metadata_cache_is_bounded():
+    """Test that the metadata cache evicts its oldest entries."""
+    import session_logger
+
+    original = config.CONVERSATIONS_DIR
+    temp_dir = tempfile.mkdtemp()
+    config.CONVERSATIONS_DIR = temp_dir
+
+    try:
+        paths = [
+            os.path.join(temp_dir, f"session_2025010{i}_000000.toml.zip")
+            for i in range(3)
+        ]
+        for path in paths:
+            _write_session_zip(path, "Hello")
+        logger = SessionLogger(script_directory="/tmp", root_dir=None)
+        with (
+            patch.dict(session_logger._METADATA_CACHE, clear=True),
+            patch.object(session_logger, "_METADATA_CACHE_MAXSIZE", 2),
+        ):
+            for path in paths:
+                logger.load_session_metadata(path)
+            assert list(session_logger._METADATA_CACHE) == paths[1:]
+
+    finally:
+        config.CONVERSATIONS_DIR = original
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
 if __name__ == "__main__":
     test_session_metadata_preview()
     test_session_metadata_free_chat()
     test_load_session_metadata_method()
     test_session_preview_truncation()
+    test_save_session_renders_only_new_messages()
+    test_list_available_sessions_files_only_newest_first()
+    test_load_session_metadata_lone_carriage_return()
+    test_load_session_metadata_cached_until_file_changes()
+    test_load_session_metadata_reads_head_only()
+    test_load_session_metadata_rereads_same_size_rewrite()
+    test_load_session_metadata_cache_is_bounded()
     print("\n✅ All session metadata tests passed!")
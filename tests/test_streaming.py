@@ -377,3 +377,120 @@ def test_live_table_redraw_never_drifts_upward():
     cursor_ups = out.count("\x1b[4A")
     assert draws >= 3, "expected several live redraws"
     assert cursor_ups == draws - 1, "one cursor-up per redraw, each exactly 4 rows"
+
+
+def test_live_table_uses_partial_usage_without_estimating():
+    from thin_wrap import LLMChat as _LLMChat_cls
+
+    class _UsageStreamingLLM(_FakeStreamingLLM):
+        def send_message(self, query, on_progress=None):
+            on_progress("word number 0 ", self.usage)
+            return self.response, self.usage
+
+    chat = _LLMChat_cls.__new__(_LLMChat_cls)
+    chat.llm_client = _UsageStreamingLLM()
+    chat.root_dir = None
+    chat.readable_files = []
+    chat.editable_files = []
+    chat.free_chat_mode = True
+
+    buf = io.StringIO()
+    with (
+        patch("thin_wrap.UI.render_markdown", side_effect=lambda text: None),
+        patch("thin_wrap.estimate_tokens") as estimate,
+        patch("sys.stdout", buf),
+    ):
+        chat._send_message("raconte moi")
+
+    estimate.assert_not_called()
+    assert "38" in buf.getvalue()
+
+
+def test_live_table_estimates_output_when_usage_lacks_it():
+    from thin_wrap import LLMChat as _LLMChat_cls
+
+    class _PromptUsageStreamingLLM(_FakeStreamingLLM):
+        def send_message(self, query, on_progress=None):
+            on_progress("word number 0 ", {"prompt_tokens": 13})
+            return self.response, self.usage
+
+    chat = _LLMChat_cls.__new__(_LLMChat_cls)
+    chat.llm_client = _PromptUsageStreamingLLM()
+    chat.root_dir = None
+    chat.readable_files = []
+    chat.editable_files = []
+    chat.free_chat_mode = True
+    chat._format_token_row = MagicMock(wraps=chat._format_token_row)
+
+    buf = io.StringIO()
+    with (
+        patch("thin_wrap.UI.render_markdown", side_effect=lambda text: None),
+        patch("thin_wrap.estimate_tokens", return_value=7) as estimate,
+        patch("sys.stdout", buf),
+    ):
+        chat._send_message("raconte moi")
+
+    estimate.assert_any_call("word number 0 ")
+    # Live row: API input count, estimated output instead of a stuck 0
+    assert chat._format_token_row.call_args_list[0].args[:3] == (13, 7, 0)
+    assert "estimated" in buf.getvalue()
+
+
+def test_user_turn_saved_while_request_in_flight():
+    import threading
+
+    request_started = threading.Event()
+    saved = []
+
+    class _SlowLogger:
+        def save_session(self, history, raise_errors=False):
+            if len(history) == 1:
+                # Only completes if the request runs concurrently
+                assert request_started.wait(timeout=5)
+            saved.append([m["role"] for m in history])
+
+    def _fake_send(on_progress=None):
+        request_started.set()
+        return "reply", None
+
+    client = _client()
+    client.conversation_history = []
+    client.session_logger = _SlowLogger()
+    with patch.object(client, "_send_message_via_httpx", side_effect=_fake_send):
+        text, _ = client.send_message("hello")
+
+    assert text == "reply"
+    assert saved == [["user"], ["user", "assistant"]]
+
+
+def test_background_save_error_reported_after_response(capsys):
+    import threading
+
+    first_save_done = threading.Event()
+
+    class _FailingLogger:
+        def save_session(self, history, raise_errors=False):
+            try:
+                if len(history) == 1:
+                    error = OSError("disk full")
+                    if raise_errors:
+                        raise error
+                    print(t("errors.error_saving_session", error=error))
+            finally:
+                first_save_done.set()
+
+    def _fake_send(on_progress=None):
+        assert first_save_done.wait(timeout=5)
+        print("streamed chunk")
+        return "reply", None
+
+    client = _client()
+    client.conversation_history = []
+    client.session_logger = _FailingLogger()
+    with patch.object(client, "_send_message_via_httpx", side_effect=_fake_send):
+        text, _ = client.send_message("hello")
+
+    assert text == "reply"
+    out = capsys.readouterr().out
+    assert out.count("disk full") == 1
+    assert out.index("streamed chunk") < out.index("disk full")
@@ -1,5 +1,6 @@
 """Text processing and encoding utilities"""
 
+import functools
 import re
 import unicodedata
 
@@ -18,8 +19,12 @@ def clean_text(text):
         else:
             text = text.decode("utf-8", errors="replace")
 
-    for old, new in config.UNICODE_REPLACEMENTS.items():
-        text = text.replace(old, new)
+    if text.isascii():
+        # O(1) for str; every replacement target is non-ASCII, so typed
+        # ASCII input has nothing to clean.
+        return text
+
+    text = text.translate(config.UNICODE_REPLACEMENTS_TABLE)
 
     try:
         text.encode("utf-8")
@@ -147,3 +152,21 @@ def estimate_tokens(text: str | None) -> int:
     estimate = max(1, estimate)
 
     return int(estimate)
+
+
+@functools.lru_cache(maxsize=128)
+def _estimate_tokens_memo(text: str) -> int:
+    # Keyed by the string itself: equal hashes never share a result, and the
+    # cache only holds references to strings the caller already has.
+    return estimate_tokens(text)
+
+
+def estimate_tokens_cached(text: str | None) -> int:
+    """Memoized :func:`estimate_tokens` for strings estimated more than once.
+
+    The same query and response are estimated for the live token table and
+    again for the final report; this avoids re-scanning them.
+    """
+    if not text or not isinstance(text, str):
+        return 0
+    return _estimate_tokens_memo(text)
@@ -11,26 +11,23 @@ import os
 import sys
 import time
 from pathlib import Path
-
-from prompt_toolkit.completion import PathCompleter
+from typing import TYPE_CHECKING
 
 # Local application imports (after third-party and standard library)
 import config
 
 config.setup_logging()
 
-from command_handler import CommandHandler
-from file_processor import generate_query
 from history_store import HistoryStore
-from input_handler import InputHandler
-from llm_client import LLMClient
 from path_utils import resolve_path
 from proxy_wrapper import create_proxy_wrapper, validate_proxy_url
-from session_logger import SessionLogger
 from strings import t
-from text_utils import clean_text, estimate_tokens
+from text_utils import clean_text, estimate_tokens, estimate_tokens_cached
 from ui import UI
 
+if TYPE_CHECKING:
+    from session_logger import SessionLogger
+
 logger = logging.getLogger(__name__)
 
 
@@ -84,6 +81,10 @@ class LLMChat:
         logger.debug("Initializing LLMChat")
         self.script_directory = os.path.dirname(os.path.abspath(__file__))
         self.config_path = config_path
+        # Render caches for the input's file-context block (redrawn on every
+        # keystroke): per-label files lines and the whole colorized block
+        self._files_line_cache: dict[str, tuple[tuple, tuple[str, str]]] = {}
+        self._context_block_cache: tuple[tuple, str] | None = None
 
         # Set config path first
         config.set_config_path(config_path)
@@ -91,7 +92,7 @@ class LLMChat:
         # Load models configuration
         try:
             models = config.get_models()
-            logger.debug(f"Loaded {len(models)} models from configuration")
+            logger.debug("Loaded %d models from configuration", len(models))
         except (FileNotFoundError, json.JSONDecodeError, ValueError) as e:
             print(f"{t('errors.models_config_load')} {e}")
             sys.exit(1)
@@ -102,28 +103,29 @@ class LLMChat:
         self._history = HistoryStore(history_file)
         self.history_file = history_file
 
-        # Process root directory
-        if root_dir is not None:
-            root_path = resolve_path(root_dir)
-            if not Path(root_path).is_dir():
-                raise ValueError(
-                    f"Specified root_dir is not a valid directory: {root_path}"
+        # Root and proxy history updates land in a single history write
+        with self._history.batch():
+            # Process root directory
+            if root_dir is not None:
+                self.root_dir = self._validated_root_dir(root_dir)
+                self.free_chat_mode = False
+                self._history.add_root(self.root_dir, already_resolved=True)
+                print(
+                    f"{t('common.info_prefix')} {t('info.using_project_root', path=self.root_dir)}"
                 )
-            self.root_dir = root_path
-            self.free_chat_mode = False
-            self._history.add_root(self.root_dir)
-            print(
-                f"{t('common.info_prefix')} {t('info.using_project_root', path=self.root_dir)}"
-            )
-        else:
-            self.root_dir = self._interactive_root_selection()
-            # Check if free chat mode was selected
-            if self.root_dir == self.FREE_CHAT_MODE:
-                self.free_chat_mode = True
-                self.root_dir = None
             else:
-                self.free_chat_mode = False
-                self._history.add_root(self.root_dir)
+                self.root_dir = self._interactive_root_selection()
+                # Check if free chat mode was selected
+                if self.root_dir == self.FREE_CHAT_MODE:
+                    self.free_chat_mode = True
+                    self.root_dir = None
+                else:
+                    self.free_chat_mode = False
+                    self._history.add_root(self.root_dir, already_resolved=True)
+
+            # Add to proxy history if valid
+            if proxy_url and validate_proxy_url(proxy_url) is None:
+                self._history.add_proxy(proxy_url)
 
         # Resolve file paths
         if self.free_chat_mode:
@@ -134,20 +136,23 @@ class LLMChat:
             assert self.root_dir is not None, (
                 "root_dir must be set when free_chat_mode is False"
             )
+            resolved_cache: dict[str, str] = {}
             self.editable_files = self._resolve_file_list(
-                editable_files or [], self.root_dir
+                editable_files or [], self.root_dir, resolved_cache
             )
             self.readable_files = self._resolve_file_list(
-                readable_files or [], self.root_dir
+                readable_files or [], self.root_dir, resolved_cache
             )
         self.first_message = first_message if first_message else ""
         self.proxy_wrapper = create_proxy_wrapper(proxy_url) if proxy_url else None
 
-        # Add to proxy history if valid
-        if proxy_url and validate_proxy_url(proxy_url) is None:
-            self._history.add_proxy(proxy_url)
+        # Initialize components (imported here so --help and argument errors
+        # don't pay for httpx, tomlkit and the command/input stack)
+        from command_handler import CommandHandler
+        from input_handler import InputHandler
+        from llm_client import LLMClient
+        from session_logger import SessionLogger
 
-        # Initialize components
         self.session_logger = SessionLogger(self.script_directory, self.root_dir)
         self.input_handler = InputHandler()
         self.llm_client = LLMClient(self.proxy_wrapper, self.session_logger)
@@ -156,14 +161,30 @@ class LLMChat:
         )
         logger.debug("Initialized all LLMChat components")
 
-    def _resolve_file_list(self, files: list[str], root_dir: str) -> list[str]:
-        """Resolve a list of file paths, skipping any that fail to resolve."""
+    def _resolve_file_list(
+        self,
+        files: list[str],
+        root_dir: str,
+        cache: dict[str, str] | None = None,
+    ) -> list[str]:
+        """Resolve a list of file paths, skipping any that fail to resolve.
+
+        *cache* maps raw entries to their resolved path; sharing it between
+        calls resolves entries given to both -r and -e only once.
+        """
+        if cache is None:
+            cache = {}
         resolved = []
         for f in files:
+            if f in cache:
+                resolved.append(cache[f])
+                continue
             try:
-                resolved.append(resolve_path(f, root_dir))
+                cache[f] = resolve_path(f, root_dir)
             except Exception as e:
                 logger.warning(f"Skipping unresolvable file {f}: {e}")
+                continue
+            resolved.append(cache[f])
         return resolved
 
     @property
@@ -175,6 +196,9 @@ class LLMChat:
         return self._history.recent_proxies
 
     def _interactive_root_selection(self) -> str:
+        from prompt_toolkit.completion import PathCompleter
+
+        completer = PathCompleter(expanduser=True)
         while True:
             sel_type, sel_value = UI.numbered_selection(
                 items=self.recent_roots,
@@ -182,16 +206,19 @@ class LLMChat:
                 prompt=t("prompts.root_enter"),
                 zero_label=t("menus.free_chat_label"),
                 allow_manual=True,
-                completer=PathCompleter(expanduser=True),
+                completer=completer,
             )
             if sel_type == "zero":
                 return self.FREE_CHAT_MODE
             if sel_type == "item":
-                return sel_value
+                if os.path.isdir(sel_value):
+                    return sel_value
+                self.reject_recent_root(sel_value)
+                continue
             # manual path entry
             try:
                 resolved = resolve_path(sel_value)
-                if Path(resolved).is_dir():
+                if os.path.isdir(resolved):
                     print(f"{t('common.using_prefix')} {resolved}")
                     return resolved
                 print(
@@ -202,19 +229,47 @@ class LLMChat:
                     f"{t('common.error_prefix')} {t('common.invalid_input', error=e)}"
                 )
 
-    def _new_session_logger(self) -> SessionLogger:
+    def reject_recent_root(self, root: str) -> None:
+        """Report a picked recent root that is no longer a directory and
+        drop it from history (recent roots are only checked on selection)."""
+        print(
+            f"{t('common.error_prefix')} {t('common.not_valid_directory', input=root)}"
+        )
+        self._history.remove_root(root)
+
+    def _new_session_logger(self) -> "SessionLogger":
         """Create a fresh SessionLogger (new timestamp → new file) and propagate it."""
+        from session_logger import SessionLogger
+
         self.session_logger = SessionLogger(self.script_directory, self.root_dir)
         self.llm_client.session_logger = self.session_logger
         self.command_handler.session_logger = self.session_logger
         return self.session_logger
 
-    def set_root_dir(self, new_root: str, ask_to_reload: bool = True) -> None:
+    @staticmethod
+    def _validated_root_dir(root_dir: str) -> str:
+        """Resolve *root_dir* and check it is a directory (ValueError if not)."""
+        root_path = resolve_path(root_dir)
+        if not os.path.isdir(root_path):
+            raise ValueError(
+                f"Specified root_dir is not a valid directory: {root_path}"
+            )
+        return root_path
+
+    def set_root_dir(
+        self,
+        new_root: str,
+        ask_to_reload: bool = True,
+        *,
+        already_resolved: bool = False,
+    ) -> None:
         """
         Change the current project root directory or switch to free chat mode.
         Args:
             new_root: New root directory path, or FREE_CHAT_MODE for free chat
             ask_to_reload: Whether to prompt user to reload a conversation from the new root
+            already_resolved: *new_root* comes from resolve_path and was just
+                checked to be a directory, so skip resolving and stat'ing it again
         """
         if new_root == self.FREE_CHAT_MODE:
             # Switch to free chat mode
@@ -231,11 +286,7 @@ class LLMChat:
             return
 
         # Otherwise, it's a directory path
-        root_path = resolve_path(new_root)
-        if not Path(root_path).is_dir():
-            raise ValueError(
-                f"Specified root_dir is not a valid directory: {root_path}"
-            )
+        root_path = new_root if already_resolved else self._validated_root_dir(new_root)
 
         old_root = self.root_dir
         self.root_dir = root_path
@@ -243,22 +294,15 @@ class LLMChat:
 
         # Clear file lists when switching to a different project root
         # Only clear if actually changing to a different directory (not same directory via different path)
-        should_clear_files = True
-        if old_root is not None:
-            # Compare resolved paths to see if it's the same directory
-            try:
-                old_resolved = resolve_path(old_root)
-            except (OSError, RuntimeError, ValueError):
-                old_resolved = None
-            if old_resolved == root_path:
-                should_clear_files = False
+        # root_dir is always stored resolved, so comparing strings suffices
+        should_clear_files = old_root != root_path
 
         if should_clear_files:
             self.editable_files = []
             self.readable_files = []
 
         # Update history
-        self._history.add_root(self.root_dir)
+        self._history.add_root(self.root_dir, already_resolved=True)
 
         # Update session logger with new root
         self._new_session_logger()
@@ -351,12 +395,31 @@ class LLMChat:
         """Format a files-summary line as ``(label_part, value_part)``.
 
         e.g. ``("Editable (2):", "a.py, b.py")`` or ``("Readable:", "None")``.
+        Memoized per label on ``(root_dir, files)``: the context block is
+        rebuilt on every render of the input, while the lists rarely change.
         """
+        cache = self._files_line_cache
+        key = (self.root_dir, tuple(file_list))
+        hit = cache.get(label)
+        if hit is not None and hit[0] == key:
+            return hit[1]
+        line = self._build_files_line(file_list, label)
+        cache[label] = (key, line)
+        return line
+
+    def _build_files_line(self, file_list, label):
+        """Build the ``(label_part, value_part)`` pair for _format_files_line."""
         if not file_list:
             return t("files.none_label", label=label), t("files.none_value")
-        # Convert to relative paths
+        # Convert to relative paths: files under the root (the usual case,
+        # already resolved) just drop the prefix; anything else goes through
+        # relpath.
+        root_prefix = os.path.join(self.root_dir, "") if self.root_dir else None
         rel_paths = []
         for f in file_list:
+            if root_prefix and f.startswith(root_prefix):
+                rel_paths.append(f[len(root_prefix) :])
+                continue
             try:
                 rel_path = os.path.relpath(f, self.root_dir)
             except ValueError:
@@ -395,9 +458,17 @@ class LLMChat:
         kept in the scrollback after sending: a blank line, then "File
         context:" and the files summary. Only the labels ("File context:",
         "Editable:", "Readable:") are green; the values stay in the default
-        color. Empty when there is no context."""
+        color. Empty when there is no context.
+
+        prompt_toolkit calls this on every redraw, so the colorized block is
+        kept until the root or either file list changes.
+        """
         if not self.editable_files and not self.readable_files:
             return ""
+        key = (self.root_dir, tuple(self.editable_files), tuple(self.readable_files))
+        cached = self._context_block_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
         lines = ["", UI.colorize(t("files.context_title"), "GREEN")]
         for file_list, label in (
             (self.editable_files, t("files.label_editable")),
@@ -405,7 +476,9 @@ class LLMChat:
         ):
             label_part, value_part = self._format_files_line(file_list, label)
             lines.append(f"{UI.colorize(label_part, 'GREEN')} {value_part}")
-        return "\n".join(lines)
+        block = "\n".join(lines)
+        self._context_block_cache = (key, block)
+        return block
 
     def _print_file_context_block(self):
         """Print the file-context block into the scrollback (after sending)."""
@@ -576,7 +649,7 @@ class LLMChat:
                 context_provider=self._file_context_block,
             )
             next_default = ""
-            if isinstance(user_input, tuple) and user_input[0] == "Ctrl+B":
+            if type(user_input) is tuple and user_input[0] == "Ctrl+B":
                 next_default = user_input[1]
                 self.command_handler.handle_files_command()
                 continue
@@ -586,10 +659,10 @@ class LLMChat:
                 print(t("info.empty_message_hint"))
                 continue
 
-            logger.debug(f"Processing user input: {user_input[:50]}...")
+            logger.debug("Processing user input: %.50s...", user_input)
 
-            if user_input.startswith("/"):
-                cmd = user_input.split()[0].lower()
+            if user_input[:1] == "/":
+                cmd = user_input.split(None, 1)[0].lower()
                 if cmd == "/files":
                     self.command_handler.handle_files_command()
                     continue
@@ -643,8 +716,10 @@ class LLMChat:
             'insert_files' if user chose to insert files (abort send),
             None otherwise
         """
+        from file_processor import generate_query
+
         model = self.llm_client.get_current_model()
-        logger.debug(f"Using model: {model}")
+        logger.debug("Using model: %s", model)
 
         query, response_parser = generate_query(
             self.root_dir or "",
@@ -670,7 +745,7 @@ class LLMChat:
         # is rendered once and its data row redrawn in place (no new lines)
         # as the streamed response progresses.
         start_time_ns = time.perf_counter_ns()
-        input_estimate = estimate_tokens(query)
+        input_estimate = estimate_tokens_cached(query)
         table_state = {"shown": False, "last_draw": 0.0}
 
         def _token_table_lines(
@@ -706,12 +781,23 @@ class LLMChat:
                 return
             table_state["last_draw"] = now
             elapsed_ms = (time.perf_counter_ns() - start_time_ns) / 1_000_000.0
+            input_tokens, output_tokens, cached_tokens = input_estimate, 0, 0
+            if partial_usage:
+                input_tokens, output_tokens, cached_tokens, _ = (
+                    self._token_usage_numbers(query, text, partial_usage)
+                )
+                input_tokens = input_tokens or input_estimate
+            if output_tokens:
+                # Counts reported mid-stream beat re-estimating the whole
+                # accumulated text on every redraw.
+                source = "API"
+            else:
+                # No output count yet (none reported, or a prompt-only usage
+                # chunk): keep estimating rather than showing 0.
+                output_tokens = estimate_tokens(text)
+                source = "estimated"
             lines = _token_table_lines(
-                input_estimate,
-                estimate_tokens(text),
-                0,
-                elapsed_ms,
-                "estimated",
+                input_tokens, output_tokens, cached_tokens, elapsed_ms, source
             )
             _redraw_token_table(lines)
 
@@ -746,7 +832,7 @@ class LLMChat:
                 _redraw_token_table(
                     _token_table_lines(
                         input_estimate,
-                        estimate_tokens(response),
+                        estimate_tokens_cached(response),
                         0,
                         duration_ms,
                         "estimated",
@@ -795,8 +881,8 @@ class LLMChat:
             )
             source = "API"
         else:
-            input_tokens = estimate_tokens(query)
-            output_tokens = estimate_tokens(response)
+            input_tokens = estimate_tokens_cached(query)
+            output_tokens = estimate_tokens_cached(response)
             cached_tokens = 0
             source = "estimated"
 
@@ -956,16 +1042,16 @@ def main():
                 )
                 logger.error(f"Invalid proxy URL provided: {args.proxy} -- {error_msg}")
                 sys.exit(1)
-            logger.debug(f"Proxy enabled: {proxy_url}")
+            logger.debug("Proxy enabled: %s", proxy_url)
 
         # Config resolution: CLI arg > env/XDG > default search
         if args.config:
             effective_config_path = args.config
-            logger.debug(f"Using config from --config arg: {effective_config_path}")
+            logger.debug("Using config from --config arg: %s", effective_config_path)
         else:
             effective_config_path = resolve_config_path()
             if effective_config_path:
-                logger.debug(f"Using resolved config path: {effective_config_path}")
+                logger.debug("Using resolved config path: %s", effective_config_path)
             else:
                 logger.debug("No env/XDG config found; using default search")
 
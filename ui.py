@@ -7,8 +7,6 @@ from pathlib import Path
 
 from prompt_toolkit import PromptSession
 from prompt_toolkit.completion import PathCompleter
-from rich.console import Console
-from rich.markdown import Markdown
 
 from strings import t
 
@@ -96,6 +94,11 @@ class UI:
         """Render markdown text with glow-like formatting."""
         if not text:
             return
+        # Imported on first render: rich.markdown pulls in markdown-it and is
+        # not needed before the first reply (nor at all for --help).
+        from rich.console import Console
+        from rich.markdown import Markdown
+
         try:
             console = Console()
             md = Markdown(make_links_visible(text))
@@ -199,13 +202,20 @@ class UI:
         """
         session = PromptSession(completer=completer) if completer else PromptSession()
 
+        # The menu does not change between retries: format it once and
+        # print it with a single write.
+        lines = [title]
+        if zero_label is not None:
+            lines.append(t("menus.option_zero", label=zero_label))
+        lines.extend(
+            t("menus.item_format", index=i, item=item_formatter(item))
+            for i, item in enumerate(items, 1)
+        )
+        lines.append(prompt)
+        menu = "\n".join(lines)
+
         while True:
-            print(title)
-            if zero_label is not None:
-                print(t("menus.option_zero", label=zero_label))
-            for i, item in enumerate(items, 1):
-                print(t("menus.item_format", index=i, item=item_formatter(item)))
-            print(prompt)
+            print(menu)
 
             try:
                 user_input = session.prompt(t("common.prompt_arrow")).strip()
@@ -217,8 +227,13 @@ class UI:
                 print(f"{t('common.error_prefix')} {t('common.empty_input')}")
                 continue
 
-            if user_input.isdigit():
+            # One parse instead of isdigit() + int(); signed numbers such as
+            # "-1" are reported as out of range rather than taken as input
+            try:
                 idx = int(user_input)
+            except ValueError:
+                idx = None
+            if idx is not None:
                 if idx == 0 and zero_label is not None:
                     print(f"{t('common.selected_prefix')} {zero_label}")
                     return ("zero", None)